@@ -1,27 +1,51 @@
-from flask import Flask, current_app, render_template, g
+from flask import Flask, render_template
 from flask_cors import CORS
+import asyncio
 import logging
 from dotenv import load_dotenv
 from pathlib import Path
 
-from async_manager import AsyncLiveKitManager
+from async_manager import AsyncLiveKitManager, submit_async, get_worker_loop
 
 
 
-# Load environment variables from keys.env
-dotenv_path = Path(__file__).parent / 'keys.env'
-load_dotenv(dotenv_path=dotenv_path)
 import os
+from types import MappingProxyType
+
+# Load environment variables from keys.env (once per process tree, so worker
+# re-imports don't parse the file again)
+dotenv_path = Path(__file__).parent / 'keys.env'
+if not os.getenv('_DOTENV_LOADED'):
+    load_dotenv(dotenv_path=dotenv_path)
+    os.environ['_DOTENV_LOADED'] = '1'
+
+# API keys resolved once at import for hot paths that would otherwise hit os.environ
+ENV = MappingProxyType({
+    name: os.getenv(name)
+    for name in (
+        'OPENAI_API_KEY',
+        'DEEPGRAM_API_KEY',
+        'LIVEKIT_URL',
+        'LIVEKIT_API_KEY',
+        'LIVEKIT_API_SECRET',
+    )
+})
+
 from app.core.config import Config
 from app.core.logging import setup_logging
+from app.core.json_provider import OrjsonProvider
+from app.core.http_client import init_http_client, install_uvloop
 
 logger = logging.getLogger(__name__)
 
 def create_app():
     """Application factory for Flask app."""
     setup_logging()
+    # Before anything starts the background worker loop, so it is created by uvloop
+    install_uvloop()
 
     app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    app.json = OrjsonProvider(app)
 
     # Initialize configuration
     config = Config()
@@ -46,25 +70,34 @@ def create_app():
         """Serve the main application"""
         return render_template('index.html')
 
-    @app.before_request
-    def before_request():
-        if 'livekit_manager' not in g:
-            try:
-                # Check if LiveKit credentials are available
-                if not all([current_app.config.get('LIVEKIT_API_KEY'), current_app.config.get('LIVEKIT_API_SECRET'), current_app.config.get('LIVEKIT_URL')]):
-                    logger.error("Missing LiveKit configuration - check environment variables")
-                    g.livekit_manager = None
-                    return
-
-                g.livekit_manager = AsyncLiveKitManager(
-                    url=current_app.config['LIVEKIT_URL'],
-                    api_key=current_app.config['LIVEKIT_API_KEY'],
-                    api_secret=current_app.config['LIVEKIT_API_SECRET']
-                )
-                logger.debug("LiveKit manager created for request")
-            except Exception as e:
-                g.livekit_manager = None
-                logger.error(f"LiveKit manager initialization failed for request: {e}", exc_info=True)
+    # Create the LiveKit manager once per app instead of once per request
+    app.livekit_manager = None
+    try:
+        # Check if LiveKit credentials are available
+        if not all([app.config.get('LIVEKIT_API_KEY'), app.config.get('LIVEKIT_API_SECRET'), app.config.get('LIVEKIT_URL')]):
+            logger.error("Missing LiveKit configuration - check environment variables")
+        else:
+            app.livekit_manager = AsyncLiveKitManager(
+                url=app.config['LIVEKIT_URL'],
+                api_key=app.config['LIVEKIT_API_KEY'],
+                api_secret=app.config['LIVEKIT_API_SECRET']
+            )
+            logger.info("LiveKit manager created")
+    except Exception as e:
+        logger.error(f"LiveKit manager initialization failed: {e}", exc_info=True)
+
+    # Start the shared HTTP client on the background loop that runs async route work
+    try:
+        submit_async(init_http_client(), timeout=10.0)
+    except Exception as e:
+        logger.error(f"HTTP client initialization failed: {e}")
+
+    # Open the OpenAI connection in the background so the first analysis skips the handshake
+    from app.api.files import interview_service
+    asyncio.run_coroutine_threadsafe(interview_service.warm_up(), get_worker_loop())
+    # Likewise open a pooled connection to the LiveKit API for the first room creation
+    if app.livekit_manager:
+        asyncio.run_coroutine_threadsafe(app.livekit_manager.validate_connection(), get_worker_loop())
 
     @app.errorhandler(404)
     def not_found(error):
@@ -1,15 +1,108 @@
 import asyncio
 import logging
-from typing import Optional
+import re
+from typing import Iterator, Optional
 from livekit import rtc
-from livekit.plugins import openai
-import os
+from livekit.plugins import openai, deepgram
+from app import ENV
 
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries for incremental TTS: terminal punctuation followed by
+# whitespace or end of text (so decimals like 3.14 are not split)
+_SENTENCE_END_RE = re.compile(r'[.!?]+(?=\s|$)')
+_ABBREVIATIONS = frozenset({'dr', 'mr', 'mrs', 'ms', 'prof', 'sr', 'jr', 'st', 'vs', 'etc', 'e.g', 'i.e'})
+_MIN_SENTENCE_LENGTH = 10
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Split text into sentences for incremental synthesis.
+
+    Abbreviations do not end a sentence, and fragments shorter than
+    _MIN_SENTENCE_LENGTH are merged into the following sentence.
+    """
+    start = 0
+    for match in _SENTENCE_END_RE.finditer(text):
+        candidate = text[start:match.end()].strip()
+        words = candidate.rstrip('.!?').rsplit(None, 1)
+        if match.group().startswith('.') and words and words[-1].lower() in _ABBREVIATIONS:
+            continue
+        if len(candidate) < _MIN_SENTENCE_LENGTH:
+            continue
+        yield candidate
+        start = match.end()
+
+    tail = text[start:].strip()
+    if tail:
+        yield tail
+
+class _ProgressiveChunker:
+    """Re-chunk 16-bit PCM frames so the first frame is short and later frames grow.
+
+    Frame duration starts at start_ms and doubles after every emitted frame up
+    to max_ms, so playback can begin before a full provider-sized frame arrives.
+    Only a tail_ms remainder is ever held back between synthesis segments.
+    """
+
+    def __init__(self, start_ms: int = 20, max_ms: int = 200, tail_ms: int = 10):
+        self._target_ms = start_ms
+        self._max_ms = max_ms
+        self._tail_ms = tail_ms
+        self._buffer = bytearray()
+        self._sample_rate = None
+        self._num_channels = None
+
+    def _frame_bytes(self, duration_ms: int) -> int:
+        return self._sample_rate * duration_ms // 1000 * self._num_channels * 2
+
+    def _make_frame(self, size: int) -> rtc.AudioFrame:
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return rtc.AudioFrame(
+            data=data,
+            sample_rate=self._sample_rate,
+            num_channels=self._num_channels,
+            samples_per_channel=size // (2 * self._num_channels),
+        )
+
+    def push(self, frame: rtc.AudioFrame) -> list:
+        """Buffer a synthesized frame and return any frames that are ready."""
+        if self._sample_rate is None:
+            self._sample_rate = frame.sample_rate
+            self._num_channels = frame.num_channels
+        self._buffer += frame.data
+
+        ready = []
+        tail = self._frame_bytes(self._tail_ms)
+        size = self._frame_bytes(self._target_ms)
+        while len(self._buffer) >= size + tail:
+            ready.append(self._make_frame(size))
+            self._target_ms = min(self._target_ms * 2, self._max_ms)
+            size = self._frame_bytes(self._target_ms)
+        return ready
+
+    def drain(self) -> list:
+        """Emit buffered audio except the tail, which is coalesced with the next segment."""
+        size = len(self._buffer) - self._frame_bytes(self._tail_ms) if self._sample_rate else 0
+        if size <= 0:
+            return []
+        # Keep whole samples on both sides of the split
+        size -= size % (2 * self._num_channels)
+        return [self._make_frame(size)] if size else []
+
+    def flush(self) -> list:
+        """Return whatever audio is still buffered as a final frame."""
+        if not self._buffer:
+            return []
+        return [self._make_frame(len(self._buffer))]
+
 class AudioManager:
     """Manages audio services including TTS and STT for the interview agent using LiveKit plugins."""
 
+    __slots__ = (
+        'agent', 'tts', 'stt', 'audio_source', 'audio_track', 'is_speaking',
+        '_speech_done', '_current_stt_provider',
+    )
+
     def __init__(self, agent):
         self.agent = agent
         self.tts = None
@@ -17,12 +110,14 @@ class AudioManager:
         self.audio_source = None
         self.audio_track = None
         self.is_speaking = False
+        # Set whenever no speech is in progress
+        self._speech_done = asyncio.Event()
+        self._speech_done.set()
         self._current_stt_provider = "livekit-openai"
 
     async def initialize_audio_services(self):
         """Initialize TTS and STT services."""
-        await self._initialize_tts_service()
-        await self._initialize_stt_service()
+        await asyncio.gather(self._initialize_tts_service(), self._initialize_stt_service())
 
         tts_status = "✅" if self.tts else "❌"
         stt_status = "✅" if self.stt else "❌"
@@ -30,7 +125,7 @@ class AudioManager:
 
     async def _initialize_tts_service(self):
         """Initialize LiveKit OpenAI TTS plugin."""
-        openai_key = os.getenv("OPENAI_API_KEY")
+        openai_key = ENV["OPENAI_API_KEY"]
         if not openai_key:
             logger.error("OpenAI API key not found - TTS unavailable")
             self.tts = None
@@ -45,7 +140,7 @@ class AudioManager:
 
     async def _initialize_stt_service(self):
         """Initialize LiveKit OpenAI STT plugin with Deepgram fallback."""
-        openai_key = os.getenv("OPENAI_API_KEY")
+        openai_key = ENV["OPENAI_API_KEY"]
         if openai_key:
             try:
                 self.stt = openai.STT(api_key=openai_key)
@@ -56,10 +151,9 @@ class AudioManager:
                 logger.warning(f"OpenAI STT plugin initialization failed: {e}, trying Deepgram fallback")
 
         # Fallback to Deepgram
-        deepgram_key = os.getenv("DEEPGRAM_API_KEY")
+        deepgram_key = ENV["DEEPGRAM_API_KEY"]
         if deepgram_key:
             try:
-                from livekit.plugins import deepgram
                 self.stt = deepgram.STT(api_key=deepgram_key)
                 logger.info("LiveKit Deepgram STT plugin initialized as fallback")
                 self._current_stt_provider = "livekit-deepgram"
@@ -88,22 +182,19 @@ class AudioManager:
             publish_options = rtc.TrackPublishOptions(source=rtc.TrackSource.SOURCE_UNKNOWN)
 
             # Wait for room to be connected
-            max_wait = 10
-            wait_count = 0
-            while not hasattr(self.agent.room, 'connection_state') or self.agent.room.connection_state != rtc.ConnectionState.CONN_CONNECTED:
-                if wait_count >= max_wait:
-                    raise Exception("Room connection timeout")
-                await asyncio.sleep(0.5)
-                wait_count += 1
-                logger.debug(f"Waiting for room connection... ({wait_count}/{max_wait})")
+            await self._wait_for_room_connected(timeout=5.0)
 
             local_participant = self.agent.room.local_participant
             if not local_participant:
                 raise Exception("Local participant is None")
 
-            existing_audio_tracks = [
+            # Scan existing publications once; the count after publishing is derived from it
+            audio_publications = [
                 p for p in local_participant.track_publications.values()
-                if p.track and p.track.kind == rtc.TrackKind.KIND_AUDIO and p.source == rtc.TrackSource.SOURCE_MICROPHONE
+                if p.track and p.track.kind == rtc.TrackKind.KIND_AUDIO
+            ]
+            existing_audio_tracks = [
+                p for p in audio_publications if p.source == rtc.TrackSource.SOURCE_MICROPHONE
             ]
             if existing_audio_tracks:
                 logger.warning("Microphone audio track already published, skipping new track publication")
@@ -115,25 +206,50 @@ class AudioManager:
             )
 
             if publication:
-                logger.info(f"Audio track published successfully - SID: {publication.sid}")
-                published_tracks = list(local_participant.track_publications.values())
-                audio_tracks = [p for p in published_tracks if p.track and p.track.kind == rtc.TrackKind.KIND_AUDIO]
-                logger.info(f"Total published audio tracks: {len(audio_tracks)}")
+                logger.info("Audio track published successfully - SID: %s", publication.sid)
+                logger.info("Total published audio tracks: %d", len(audio_publications) + 1)
             else:
                 raise Exception("Track publication returned None")
 
         except Exception as e:
-            logger.error(f"Audio track setup failed: {e}", exc_info=True)
+            logger.error("Audio track setup failed: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Audio track setup traceback", exc_info=True)
             self.audio_source = None
             self.audio_track = None
             raise
 
+    async def _wait_for_room_connected(self, timeout: float):
+        """Wait for the room's connection_state_changed event instead of polling."""
+        room = self.agent.room
+        if room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
+            return
+
+        connected = asyncio.Event()
+
+        def on_connection_state_changed(state):
+            if state == rtc.ConnectionState.CONN_CONNECTED:
+                connected.set()
+
+        room.on("connection_state_changed", on_connection_state_changed)
+        try:
+            # Re-check in case the room connected before the handler was registered
+            if room.connection_state == rtc.ConnectionState.CONN_CONNECTED:
+                return
+            logger.debug("Waiting for room connection...")
+            await asyncio.wait_for(connected.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            raise Exception("Room connection timeout")
+        finally:
+            room.off("connection_state_changed", on_connection_state_changed)
+
     async def say(self, text: str, check_speaking: bool = True, max_retries: int = 2):
         """Speech synthesis using LiveKit TTS plugin."""
         if self.is_speaking and check_speaking:
             logger.warning(f"Agent already speaking, queuing: {text[:50]}...")
-            await asyncio.sleep(1)
-            if self.is_speaking:
+            try:
+                await asyncio.wait_for(self._speech_done.wait(), timeout=1)
+            except asyncio.TimeoutError:
                 logger.warning("Still speaking, skipping message")
                 return
 
@@ -141,24 +257,25 @@ class AudioManager:
             logger.warning("Empty text provided to _say, skipping")
             return
 
-        for attempt in range(max_retries):
-            self.is_speaking = True
-            self.agent.state.last_spoken_text = text
+        if not self.tts:
+            logger.error("TTS service not available")
+            return
 
-            try:
-                if not self.tts:
-                    logger.error("TTS service not available")
-                    return
+        if not self.audio_source or not self.audio_track:
+            logger.error("Audio source/track not initialized")
+            return
 
-                if not self.audio_source or not self.audio_track:
-                    logger.error("Audio source/track not initialized")
-                    return
+        self.agent.state.last_spoken_text = text
+
+        for attempt in range(max_retries):
+            try:
+                self.is_speaking = True
+                self._speech_done.clear()
 
                 logger.info(f"Agent speaking (attempt {attempt + 1}): '{text[:100]}{'...' if len(text) > 100 else ''}'")
 
-                # Use LiveKit TTS plugin synthesize
-                async for synthesized in self.tts.synthesize(text):
-                    await self.audio_source.capture_frame(synthesized.frame)
+                # Synthesize sentence by sentence so playback starts after the first one
+                await self._speak_sentences(text)
 
                 logger.info("Speech completed successfully")
                 return
@@ -168,12 +285,56 @@ class AudioManager:
 
             finally:
                 self.is_speaking = False
+                self._speech_done.set()
 
             if attempt < max_retries - 1:
                 await asyncio.sleep(1)
 
         logger.error(f"Speech synthesis failed after {max_retries} attempts")
 
+    async def _synthesize_into(self, text: str, queue: asyncio.Queue):
+        """Synthesize text and push its frames onto queue, ending with None."""
+        try:
+            async for synthesized in self.tts.synthesize(text):
+                queue.put_nowait(synthesized.frame)
+        finally:
+            queue.put_nowait(None)
+
+    async def _speak_sentences(self, text: str):
+        """Play text sentence by sentence, synthesizing the next sentence while the current one plays."""
+        sentences = list(_iter_sentences(text)) or [text]
+        queues = [asyncio.Queue() for _ in sentences]
+        tasks = []
+        chunker = _ProgressiveChunker()
+
+        def start_synthesis(index: int):
+            tasks.append(asyncio.create_task(self._synthesize_into(sentences[index], queues[index])))
+
+        start_synthesis(0)
+        try:
+            for index, queue in enumerate(queues):
+                if index + 1 < len(sentences):
+                    start_synthesis(index + 1)
+
+                while True:
+                    frame = await queue.get()
+                    if frame is None:
+                        break
+                    for chunk in chunker.push(frame):
+                        await self.audio_source.capture_frame(chunk)
+
+                # Between sentences hold back only the short tail; the last sentence flushes everything
+                remaining = chunker.drain() if index + 1 < len(sentences) else chunker.flush()
+                for chunk in remaining:
+                    await self.audio_source.capture_frame(chunk)
+
+                # Surface synthesis errors so the caller can retry
+                await tasks[index]
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     async def say_with_completion_tracking(self, text: str, max_retries: int = 3):
         """Enhanced speech synthesis with completion tracking and retry logic."""
         logger.info(f"Speaking with completion tracking: '{text[:50]}...'")
@@ -189,15 +350,13 @@ class AudioManager:
         """Wait for all speech to complete before proceeding."""
         logger.info(f"Waiting for all speech completion (timeout: {timeout}s)")
 
-        start_time = asyncio.get_event_loop().time()
-        while asyncio.get_event_loop().time() - start_time < timeout:
-            if not self.is_speaking:
-                logger.info("All speech completed")
-                return True
-            await asyncio.sleep(0.1)
-
-        logger.warning(f"Speech completion timeout after {timeout}s")
-        return False
+        try:
+            await asyncio.wait_for(self._speech_done.wait(), timeout=timeout)
+            logger.info("All speech completed")
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"Speech completion timeout after {timeout}s")
+            return False
 
     async def test_audio_pipeline(self, test_text: str) -> bool:
         """Test the audio pipeline using LiveKit TTS plugin."""
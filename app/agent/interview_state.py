@@ -1,12 +1,27 @@
+import asyncio
 import logging
+import aiohttp
 from typing import Dict, Optional, List
 from datetime import datetime
+from app.core.http_client import get_http_client
+from app.core.errors import SessionError
 
 logger = logging.getLogger(__name__)
 
+_BACKEND_TIMEOUT = aiohttp.ClientTimeout(total=5)
+_BACKEND_COALESCE_DELAY = 0.15  # Seconds to collect updates before sending one PUT
+
 class InterviewState:
     """Enhanced interview state management without FSM."""
 
+    __slots__ = (
+        'candidate_name', 'position', 'questions', 'current_question_index',
+        'responses', 'evaluations', 'session_id', 'backend_url', 'room_name',
+        'max_retries', 'last_spoken_text', 'current_answer_text',
+        'last_speech_time', 'speech_pause_threshold', 'no_response_count',
+        '_pending_update', '_flush_task', '_shutdown_flush_registered',
+    )
+
     def __init__(self):
         self.candidate_name: Optional[str] = None
         self.position: Optional[str] = None
@@ -23,6 +38,9 @@ class InterviewState:
         self.last_speech_time: Optional[float] = None  # Track when speech was last received
         self.speech_pause_threshold: float = 2.0  # Seconds of silence to consider answer complete
         self.no_response_count: int = 0  # Track consecutive no-response attempts
+        self._pending_update: Dict = {}  # Updates merged until the next backend flush
+        self._flush_task: Optional[asyncio.Task] = None
+        self._shutdown_flush_registered: bool = False
 
     def get_current_question(self) -> Optional[Dict]:
         if 0 <= self.current_question_index < len(self.questions):
@@ -52,32 +70,72 @@ class InterviewState:
         return self.current_question_index < len(self.questions)
 
     async def update_backend(self, data: Dict):
-        """Update session data on the backend."""
-        import aiohttp
+        """Queue a session update; updates arriving within a short window are sent as one PUT."""
         if not self.session_id:
             return
+        self._pending_update.update(data)
+        self._register_shutdown_flush()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_backend_later())
+
+    def _register_shutdown_flush(self):
+        """Have the running LiveKit job send queued updates before it shuts down."""
+        if self._shutdown_flush_registered:
+            return
+        try:
+            from livekit.agents import get_job_context
+            get_job_context().add_shutdown_callback(self._flush_on_shutdown)
+            self._shutdown_flush_registered = True
+        except RuntimeError:
+            pass  # Not inside a job; the owner must await flush_backend() itself
+
+    async def _flush_on_shutdown(self):
+        # Let a scheduled flush finish rather than cancel it mid-PUT, then send the rest
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=5),
-                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=30)
-            ) as session:
-                async with session.put(
-                    f"{self.backend_url}/api/session/{self.session_id}",
-                    json=data,
-                    timeout=aiohttp.ClientTimeout(total=5)
-                ) as response:
-                    if response.status != 200:
-                        # Log warning but do not raise
-                        logger.warning(f"Backend update returned status {response.status}")
+            await self.flush_backend()
+        except Exception as e:
+            logger.error(f"Error sending final backend update: {e}")
+
+    async def _flush_backend_later(self):
+        await asyncio.sleep(_BACKEND_COALESCE_DELAY)
+        try:
+            await self.flush_backend()
         except Exception as e:
             logger.error(f"Error updating backend: {e}")
 
+    async def flush_backend(self):
+        """Send any pending updates to the backend immediately; raises if a PUT fails."""
+        # Updates queued while a PUT is in flight don't schedule a new flush (this task
+        # is still running), so keep sending until nothing is left
+        while self._pending_update:
+            data, self._pending_update = self._pending_update, {}
+            await self._put_backend(data)
+
+    async def _put_backend(self, data: Dict):
+        """Update session data on the backend; raises on connection errors and non-200 replies."""
+        # Reuse the pooled process-wide session instead of a new connector per call
+        client = get_http_client()
+        await client.start()
+        async with client.session.put(
+            f"{self.backend_url}/api/session/{self.session_id}",
+            json=data,
+            timeout=_BACKEND_TIMEOUT
+        ) as response:
+            if response.status != 200:
+                raise SessionError(f"Backend update returned status {response.status}", self.session_id)
+
     async def update_backend_with_retry(self, data: Dict, max_retries: int = 3):
         """Update backend with retry logic for reliability."""
-        import asyncio
+        if not self.session_id:
+            return False
+        # Send immediately, folding in anything still waiting to be coalesced
+        self._pending_update.update(data)
+        data, self._pending_update = self._pending_update, {}
         for attempt in range(max_retries):
             try:
-                await self.update_backend(data)
+                await self._put_backend(data)
                 logger.info(f"Backend update successful on attempt {attempt + 1}")
                 return True
             except Exception as e:
@@ -1,23 +1,91 @@
 from flask import Blueprint, render_template, jsonify, current_app, g
 import os
-import json
+import threading
+import orjson
 from pathlib import Path
 from datetime import datetime
 from async_manager import run_async_in_new_loop
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-@dashboard_bp.route('/dashboard')
-def dashboard():
-    """Serve the dashboard page"""
-    return render_template('dashboard.html')
+# Parsed session summaries keyed by file path string: (mtime_ns, size, summary)
+_SESSION_CACHE = {}
+_SESSION_CACHE_LOCK = threading.RLock()
+# Aggregated (sessions, stats) built from _SESSION_CACHE; rebuilt only when
+# _load_session_summaries reports a change
+_SNAPSHOT_CACHE = {'data': None}
+
+def _summarize_session(file_stem, session_data):
+    """Extract the fields the dashboard needs from a session file."""
+    return {
+        'session_id': session_data.get('session_id', file_stem),
+        'candidate_name': session_data.get('candidate_name', 'Unknown'),
+        'position': session_data.get('position', 'Unknown'),
+        'email': session_data.get('email', 'Unknown'),
+        'status': session_data.get('status', 'unknown'),
+        'created_at': session_data.get('created_at', 'Unknown'),
+        'completed_at': session_data.get('completed_at', None),
+        'room_name': session_data.get('room_name', None),
+        'transcript_count': len(session_data.get('transcript', [])),
+        'questions_count': len(session_data.get('questions', [])),
+        'has_analysis': bool(session_data.get('analysis')),
+        'has_evaluation': bool(session_data.get('evaluation'))
+    }
+
+def _load_session_summaries(sessions_dir):
+    """Refresh the summary cache, re-parsing only changed files.
+
+    Returns True if any summary was added, updated or removed.
+    """
+    changed = False
+    if not sessions_dir.exists():
+        changed = bool(_SESSION_CACHE)
+        _SESSION_CACHE.clear()
+        return changed
+
+    seen = set()
+    with os.scandir(sessions_dir) as it:
+        for entry in it:
+            if not entry.name.endswith('.json') or not entry.is_file(follow_symlinks=False):
+                continue
+            try:
+                st = entry.stat()
+                cached = _SESSION_CACHE.get(entry.path)
+                if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                    seen.add(entry.path)
+                    continue
+
+                # Parse from raw bytes and keep only the summary; the full
+                # session dict (transcript, questions, analysis) is dropped here
+                with open(entry.path, 'rb') as f:
+                    session_data = orjson.loads(f.read())
+
+                summary = _summarize_session(entry.name[:-5], session_data)
+                del session_data
+                _SESSION_CACHE[entry.path] = (st.st_mtime_ns, st.st_size, summary)
+                # Only files that stat and parse are kept; a file that became unreadable
+                # falls through to the stale sweep below instead of serving its old summary
+                seen.add(entry.path)
+                changed = True
+
+            except Exception as e:
+                current_app.logger.warning(f"Error reading session file {entry.path}: {e}")
+                continue
+
+    # Drop entries for deleted or unreadable session files
+    for stale in set(_SESSION_CACHE) - seen:
+        del _SESSION_CACHE[stale]
+        changed = True
+
+    return changed
+
+def _compute_dashboard_snapshot(sessions_dir):
+    """Return (sessions, stats) for the dashboard from a single directory walk."""
+    with _SESSION_CACHE_LOCK:
+        changed = _load_session_summaries(sessions_dir)
+        if not changed and _SNAPSHOT_CACHE['data'] is not None:
+            return _SNAPSHOT_CACHE['data']
 
-@dashboard_bp.route('/api/dashboard/sessions')
-def get_sessions():
-    """Get all interview sessions for dashboard"""
-    try:
-        # Get all session files
-        sessions_dir = Path(current_app.root_path).parent / 'interview_sessions'
         sessions = []
         stats = {
             'total_sessions': 0,
@@ -28,49 +96,39 @@ def get_sessions():
             'total_questions': 0
         }
 
-        if sessions_dir.exists():
-            for session_file in sessions_dir.glob('*.json'):
-                try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
-
-                    # Format session for dashboard
-                    session_info = {
-                        'session_id': session_data.get('session_id', session_file.stem),
-                        'candidate_name': session_data.get('candidate_name', 'Unknown'),
-                        'position': session_data.get('position', 'Unknown'),
-                        'email': session_data.get('email', 'Unknown'),
-                        'status': session_data.get('status', 'unknown'),
-                        'created_at': session_data.get('created_at', 'Unknown'),
-                        'completed_at': session_data.get('completed_at', None),
-                        'room_name': session_data.get('room_name', None),
-                        'transcript_count': len(session_data.get('transcript', [])),
-                        'questions_count': len(session_data.get('questions', [])),
-                        'has_analysis': bool(session_data.get('analysis')),
-                        'has_evaluation': bool(session_data.get('evaluation'))
-                    }
-                    sessions.append(session_info)
-
-                    # Update stats
-                    stats['total_sessions'] += 1
-                    status = session_data.get('status')
-                    if status == 'completed':
-                        stats['completed_sessions'] += 1
-                    elif status == 'interviewing':
-                        stats['active_sessions'] += 1
-                    elif status in ['failed', 'error']:
-                        stats['failed_sessions'] += 1
-
-                    stats['total_transcripts'] += len(session_data.get('transcript', []))
-                    stats['total_questions'] += len(session_data.get('questions', []))
-
-                except Exception as e:
-                    current_app.logger.warning(f"Error reading session file {session_file}: {e}")
-                    continue
+        for _, _, session_info in _SESSION_CACHE.values():
+            sessions.append(session_info)
+
+            stats['total_sessions'] += 1
+            status = session_info['status']
+            if status == 'completed':
+                stats['completed_sessions'] += 1
+            elif status == 'interviewing':
+                stats['active_sessions'] += 1
+            elif status in ['failed', 'error']:
+                stats['failed_sessions'] += 1
+
+            stats['total_transcripts'] += session_info['transcript_count']
+            stats['total_questions'] += session_info['questions_count']
 
         # Sort by creation date (newest first)
         sessions.sort(key=lambda x: x.get('created_at', ''), reverse=True)
 
+        _SNAPSHOT_CACHE['data'] = (sessions, stats)
+        return _SNAPSHOT_CACHE['data']
+
+@dashboard_bp.route('/dashboard')
+def dashboard():
+    """Serve the dashboard page"""
+    return render_template('dashboard.html')
+
+@dashboard_bp.route('/api/dashboard/sessions')
+def get_sessions():
+    """Get all interview sessions for dashboard"""
+    try:
+        sessions_dir = Path(current_app.root_path).parent / 'interview_sessions'
+        sessions, stats = _compute_dashboard_snapshot(sessions_dir)
+
         return jsonify({
             'success': True,
             'data': {
@@ -91,33 +149,7 @@ def get_stats():
     """Get dashboard statistics"""
     try:
         sessions_dir = Path(current_app.root_path).parent / 'interview_sessions'
-        stats = {
-            'total_sessions': 0,
-            'completed_sessions': 0,
-            'active_sessions': 0,
-            'total_transcripts': 0,
-            'total_questions': 0
-        }
-
-        if sessions_dir.exists():
-            for session_file in sessions_dir.glob('*.json'):
-                try:
-                    with open(session_file, 'r', encoding='utf-8') as f:
-                        session_data = json.load(f)
-
-                    stats['total_sessions'] += 1
-
-                    if session_data.get('status') == 'completed':
-                        stats['completed_sessions'] += 1
-                    elif session_data.get('status') == 'interviewing':
-                        stats['active_sessions'] += 1
-
-                    stats['total_transcripts'] += len(session_data.get('transcript', []))
-                    stats['total_questions'] += len(session_data.get('questions', []))
-
-                except Exception as e:
-                    current_app.logger.warning(f"Error reading session file for stats {session_file}: {e}")
-                    continue
+        _, stats = _compute_dashboard_snapshot(sessions_dir)
 
         return jsonify({
             'success': True,
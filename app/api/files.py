@@ -7,7 +7,7 @@ from app.services.document_service import DocumentProcessingService
 from app.services.interview_service import InterviewService
 from app.core.config import Config
 from app.core.errors import ValidationError, FileProcessingError
-from async_manager import run_async_with_cleanup, run_async_in_new_loop
+from async_manager import run_async_with_cleanup, submit_async
 
 files_bp = Blueprint('files', __name__)
 
@@ -15,15 +15,53 @@ document_service = DocumentProcessingService()
 interview_service = InterviewService()
 logger = logging.getLogger(__name__)
 
-def allowed_file(filename):
+_ALLOWED_EXTENSIONS = Config.ALLOWED_EXTENSIONS
+
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+def allowed_file(filename: str) -> bool:
     """Check if file extension is allowed."""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    dot = filename.rfind('.')
+    return dot != -1 and filename[dot + 1:].lower() in _ALLOWED_EXTENSIONS
+
+def _read_upload(file_storage, max_size):
+    """Read an uploaded file, returning None if it exceeds max_size."""
+    stream = file_storage.stream
+    if getattr(stream, 'seekable', None) and stream.seekable():
+        # Spooled uploads know their size; check it and read once without an extra buffer copy
+        stream.seek(0, os.SEEK_END)
+        size = stream.tell()
+        stream.seek(0)
+        return stream.read() if size <= max_size else None
+
+    buffer = bytearray()
+    while True:
+        chunk = stream.read(_UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        buffer += chunk
+        if len(buffer) > max_size:
+            return None
+    return bytes(buffer)
+
+async def _extract_both(jd_content, jd_filename, resume_content, resume_filename):
+    """Extract text from the job description and resume concurrently."""
+    return await asyncio.gather(
+        document_service.extract_text_from_file_async(jd_content, jd_filename),
+        document_service.extract_text_from_file_async(resume_content, resume_filename)
+    )
 
 @files_bp.route('/api/upload', methods=['POST'])
 def upload_files():
     """Upload and process job description and resume files"""
     try:
+        # Check file sizes (10MB limit)
+        max_size = 10 * 1024 * 1024  # 10MB
+
+        # Reject oversized requests before parsing the multipart body
+        if request.content_length and request.content_length > 2 * max_size:
+            return jsonify({"error": "File size too large. Maximum 10MB per file."}), 400
+
         if 'jd_file' not in request.files or 'resume_file' not in request.files:
             return jsonify({
                 "error": "Both job description and resume files are required"
@@ -35,12 +73,10 @@ def upload_files():
         if jd_file.filename == '' or resume_file.filename == '':
             return jsonify({"error": "Please select both files"}), 400
 
-        # Check file sizes (10MB limit)
-        max_size = 10 * 1024 * 1024  # 10MB
-        jd_content = jd_file.read()
-        resume_content = resume_file.read()
+        jd_content = _read_upload(jd_file, max_size)
+        resume_content = _read_upload(resume_file, max_size) if jd_content is not None else None
 
-        if len(jd_content) > max_size or len(resume_content) > max_size:
+        if jd_content is None or resume_content is None:
             return jsonify({"error": "File size too large. Maximum 10MB per file."}), 400
 
         # Extract text from files
@@ -48,8 +84,11 @@ def upload_files():
         resume_filename = resume_file.filename or "resume.txt"
 
         try:
-            jd_text = document_service.extract_text_from_file(jd_content, jd_filename)
-            resume_text = document_service.extract_text_from_file(resume_content, resume_filename)
+            # Parse both documents in parallel worker processes
+            jd_text, resume_text = submit_async(
+                _extract_both(jd_content, jd_filename, resume_content, resume_filename),
+                timeout=60.0
+            )
         except Exception as e:
             return jsonify({"error": f"File processing failed: {str(e)}"}), 400
 
@@ -80,8 +119,8 @@ def analyze_documents():
             return jsonify(
                 {"error": "Job description and resume text are required"}), 400
 
-        # Run analysis using proper async utility in new event loop
-        analysis = run_async_in_new_loop(
+        # Run analysis on the shared background event loop
+        analysis = submit_async(
             interview_service.analyze_documents(jd_text, resume_text),
             timeout=30.0
         )
@@ -109,10 +148,11 @@ def generate_questions():
         if num_questions < 1 or num_questions > 20:
             return jsonify({"error": "Number of questions must be between 1 and 20"}), 400
 
-        # Run question generation using proper async utility in new event loop
-        questions = run_async_in_new_loop(
+        # Run question generation on the shared background event loop
+        # A prior /api/analyze result lets the prompt skip most of the resume
+        questions = submit_async(
             interview_service.generate_interview_questions(
-                jd_text, resume_text, num_questions),
+                jd_text, resume_text, num_questions, analysis=data.get('analysis')),
             timeout=30.0
         )
 
@@ -121,3 +161,35 @@ def generate_questions():
     except Exception as e:
         logger.error(f"Question generation error: {e}")
         return jsonify({"error": f"Question generation failed: {str(e)}"}), 500
+
+@files_bp.route('/api/prepare-interview', methods=['POST'])
+def prepare_interview():
+    """Analyze documents and generate interview questions in one LLM call"""
+    try:
+        data = request.get_json()
+        jd_text = data.get('jd_text', '')
+        resume_text = data.get('resume_text', '')
+        num_questions = int(data.get('num_questions', 6))
+
+        if not jd_text or not resume_text:
+            return jsonify(
+                {"error": "Job description and resume text are required"}), 400
+
+        # Validate number of questions
+        if num_questions < 1 or num_questions > 20:
+            return jsonify({"error": "Number of questions must be between 1 and 20"}), 400
+
+        result = submit_async(
+            interview_service.analyze_and_generate(jd_text, resume_text, num_questions),
+            timeout=45.0
+        )
+
+        return jsonify({
+            "success": True,
+            "analysis": result["analysis"],
+            "questions": result["questions"]
+        })
+
+    except Exception as e:
+        logger.error(f"Interview preparation error: {e}")
+        return jsonify({"error": f"Interview preparation failed: {str(e)}"}), 500
@@ -1,6 +1,5 @@
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, current_app
 import datetime
-from flask import g
 from app.services.livekit_service import LiveKitService
 from app.core.config import Config
 
@@ -9,9 +8,8 @@ health_bp = Blueprint('health', __name__)
 @health_bp.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
-    livekit_manager = getattr(g, 'livekit_manager', None)
     return jsonify({
         "status": "healthy",
-        "livekit_connected": livekit_manager is not None,
+        "livekit_connected": current_app.livekit_manager is not None,
         "timestamp": datetime.datetime.now().isoformat()
     })
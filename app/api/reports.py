@@ -1,5 +1,7 @@
 from flask import Blueprint, request, jsonify, send_file, current_app
+import atexit
 import os
+import threading
 import json
 from io import BytesIO
 from reportlab.lib.pagesizes import letter
@@ -12,12 +14,37 @@ from app.services.session_service import InterviewSessionService
 from app.services.email_service import EmailService
 from app.core.config import Config
 from app.core.errors import ValidationError, SessionError, EmailError
-from async_manager import run_async_in_new_loop, run_async_with_cleanup
+from async_manager import run_async_in_new_loop, run_async_with_cleanup, submit_async
 
 reports_bp = Blueprint('reports', __name__)
 
 session_service = InterviewSessionService()
 
+# One EmailService for the process, so its SMTP sessions stay open between report sends
+_email_service = None
+_email_service_lock = threading.Lock()
+
+def _get_email_service(config):
+    """Return the shared EmailService, creating it on first use."""
+    global _email_service
+    with _email_service_lock:
+        if _email_service is None:
+            _email_service = EmailService(
+                config.SMTP_SERVER,
+                config.SMTP_PORT,
+                config.SMTP_USERNAME,
+                config.SMTP_PASSWORD
+            )
+            atexit.register(_close_email_service)
+    return _email_service
+
+def _close_email_service():
+    """Quit the pooled SMTP sessions on the worker loop they were opened on."""
+    try:
+        submit_async(_email_service.close(), timeout=5.0)
+    except Exception:
+        pass  # submit_async already logged it; nothing more to do at exit
+
 def create_pdf_report(session_data, session_id):
     """Create a professional PDF report from session data"""
     buffer = BytesIO()
@@ -287,20 +314,17 @@ def send_report_email(session_id):
             'evaluation': session_data.get('evaluation', {})
         }
 
-        # Create email service
-        email_service = EmailService(
-            config.SMTP_SERVER,
-            config.SMTP_PORT,
-            config.SMTP_USERNAME,
-            config.SMTP_PASSWORD
-        )
+        email_service = _get_email_service(config)
 
         # Generate PDF report for email attachment
         pdf_buffer = create_pdf_report(session_data, session_id)
         pdf_data = pdf_buffer.getvalue()
 
-        # Send report to both candidate and HR
-        success = email_service.send_interview_report_with_pdf(candidate_email, pdf_data, session_id)
+        # Send report to both candidate and HR over the pooled SMTP sessions on the shared event loop
+        success = submit_async(
+            email_service.send_interview_report_with_pdf(candidate_email, pdf_data, session_id),
+            timeout=60.0
+        )
 
         if not success:
             raise EmailError('Failed to send report emails')
@@ -11,7 +11,7 @@ from flask import current_app
 from app.core.errors import ValidationError, SessionError
 from app.core.validation import InputValidator
 from app.core.response import APIResponse
-from async_manager import AsyncLiveKitManager, run_async_with_cleanup, run_async_in_new_loop
+from async_manager import AsyncLiveKitManager, run_async_in_new_loop, submit_async
 
 sessions_bp = Blueprint('sessions', __name__)
 
@@ -19,6 +19,10 @@ session_service = InterviewSessionService()
 email_service = EmailService()
 logger = logging.getLogger(__name__)
 
+@sessions_bp.before_request
+def attach_livekit_manager():
+    """Expose the app-wide LiveKit manager to session routes, the only ones that use it."""
+    g.livekit_manager = current_app.livekit_manager
 
 
 def _validate_session_input(data):
@@ -73,7 +77,7 @@ def _create_livekit_room(livekit_manager, room_name):
         raise SessionError("LiveKit service not available")
 
     try:
-        room_result = run_async_in_new_loop(livekit_manager.create_room_async(room_name))
+        room_result = submit_async(livekit_manager.create_room_async(room_name))
         if not room_result or not room_result.get("success"):
             error_msg = room_result.get('error', 'Unknown error') if room_result else 'No response'
             raise SessionError(f"Failed to create room: {error_msg}")
@@ -122,8 +126,9 @@ def create_session():
         room_service = RoomService(livekit_service)
         session_ops = SessionOperations(session_service, room_service)
 
-        # Create complete session with room and tokens
-        result = run_async_in_new_loop(session_ops.create_complete_session(validated_data))
+        # Create complete session with room and tokens; runs on the worker loop so the
+        # LiveKit calls reuse the pooled HTTP session started there
+        result = submit_async(session_ops.create_complete_session(validated_data))
 
         if not result.get("success"):
             return APIResponse.error(result.get("error", "Session creation failed"), "creation_error", 500)
@@ -211,13 +216,12 @@ def get_session_by_room(room_name):
     """Get session by room name"""
     try:
         room_name = InputValidator.validate_room_name(room_name)
-        sessions = run_async_in_new_loop(session_service.list_sessions())
-        for session_data in sessions:
-            if session_data.get('room_name') == room_name:
-                return APIResponse.success({
-                    "session_id": session_data['session_id'],
-                    "session": session_data
-                })
+        session_data = run_async_in_new_loop(session_service.get_session_by_room(room_name))
+        if session_data:
+            return APIResponse.success({
+                "session_id": session_data['session_id'],
+                "session": session_data
+            })
         return APIResponse.not_found("Session", f"room:{room_name}")
 
     except Exception as e:
@@ -235,7 +239,7 @@ def create_test_room(room_name):
         return await livekit_manager.create_room_async(room_name)
 
     try:
-        result = run_async_with_cleanup(_create_room())
+        result = submit_async(_create_room())
         return jsonify(result)
     except Exception as e:
         logger.error(f"Room creation failed: {e}")
@@ -252,7 +256,7 @@ def get_room_participants(room_name):
         return await livekit_manager.list_participants_async(room_name)
 
     try:
-        participants = run_async_with_cleanup(_get_participants())
+        participants = submit_async(_get_participants())
         if participants is None:
             return jsonify([]), 200  # Return empty list instead of 404
         return jsonify(participants)
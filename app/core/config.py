@@ -5,6 +5,8 @@ from typing import Optional
 class Config:
     """Application configuration management."""
 
+    ALLOWED_EXTENSIONS = frozenset({'pdf', 'docx', 'txt'})
+
     def __init__(self):
         """Initialize configuration with validation and TLS setup."""
         self._load_config()
@@ -39,7 +41,6 @@ class Config:
         # Application settings
         self.BACKEND_URL = os.getenv('BACKEND_URL', 'http://localhost:5000')
         self.MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-        self.ALLOWED_EXTENSIONS = {'pdf', 'docx', 'txt'}
 
         # Authentication
         self.API_KEY = os.getenv('API_KEY')
@@ -1,25 +1,78 @@
 import aiohttp
 import asyncio
 import logging
+import os
+import random
+import sys
+import threading
 from typing import Optional, Dict, Any
 from contextlib import asynccontextmanager
 
 logger = logging.getLogger(__name__)
 
+def install_uvloop() -> bool:
+    """Make uvloop the default event loop policy for loops created after this call.
+
+    Called by the web app factory rather than at import, since the policy is
+    process-wide and the agent process imports this module too.
+    """
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return False
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return True
+
+def _default_resolver() -> aiohttp.abc.AbstractResolver:
+    """Prefer the c-ares (aiodns) resolver so DNS lookups don't block a thread-pool worker.
+
+    Falls back to the threaded resolver when aiodns is missing or on Windows,
+    where aiodns does not work with the default Proactor event loop.
+    """
+    if sys.platform != 'win32':
+        try:
+            return aiohttp.AsyncResolver()
+        except (ImportError, RuntimeError) as e:
+            logger.debug(f"aiodns resolver unavailable, using threaded resolver: {e}")
+    return aiohttp.ThreadedResolver()
+
 class AsyncHTTPClient:
     """Async HTTP client with connection pooling for external API calls."""
 
-    def __init__(self, timeout: int = 30, max_connections: int = 10):
+    def __init__(self, timeout: int = 30, max_connections: Optional[int] = None,
+                 max_connections_per_host: Optional[int] = None,
+                 dns_resolver: Optional[aiohttp.abc.AbstractResolver] = None,
+                 ttl_dns_cache: int = 900, use_dns_cache: bool = True):
+        if max_connections is None:
+            max_connections = int(os.getenv('HTTP_POOL_LIMIT', '100'))
+        if max_connections_per_host is None:
+            max_connections_per_host = int(os.getenv('HTTP_POOL_LIMIT_PER_HOST', '30'))
+
         self.timeout = aiohttp.ClientTimeout(total=timeout)
-        self.connector = aiohttp.TCPConnector(
+        # The connector is built in start() so it binds to the loop that serves requests
+        self._dns_resolver = dns_resolver
+        self._connector_kwargs = dict(
             limit=max_connections,
-            limit_per_host=max_connections,
-            ttl_dns_cache=300,
-            use_dns_cache=True,
+            limit_per_host=max_connections_per_host,
+            # API hosts are fixed, so cache lookups longer; disable for round-robin DNS targets
+            ttl_dns_cache=ttl_dns_cache,
+            use_dns_cache=use_dns_cache,
             keepalive_timeout=60,
             enable_cleanup_closed=True
         )
+        self.connector: Optional[aiohttp.TCPConnector] = None
         self.session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Guards session creation across threads; creation never awaits, so a plain lock
+        # suffices and no asyncio primitive is shared between loops
+        self._start_lock = threading.Lock()
+        # Bounds in-flight requests so retry bursts queue here instead of piling tasks onto
+        # the loop; created in start() on the same loop as the session
+        self._max_in_flight = max_connections * 2
+        self._in_flight: Optional[asyncio.Semaphore] = None
 
     async def __aenter__(self):
         await self.start()
@@ -30,39 +83,66 @@ class AsyncHTTPClient:
 
     async def start(self):
         """Initialize the HTTP session."""
-        if self.session is None:
-            self.session = aiohttp.ClientSession(
-                connector=self.connector,
-                timeout=self.timeout,
-                trust_env=True  # Use environment proxy settings
-            )
-            logger.info("AsyncHTTPClient session started")
+        if self.session is not None:
+            return
+
+        # Concurrent first callers wait here instead of each creating a session
+        with self._start_lock:
+            if self.session is None:
+                self.connector = aiohttp.TCPConnector(
+                    resolver=self._dns_resolver or _default_resolver(),
+                    **self._connector_kwargs
+                )
+                self.session = aiohttp.ClientSession(
+                    connector=self.connector,
+                    timeout=self.timeout,
+                    trust_env=True  # Use environment proxy settings
+                )
+                self._in_flight = asyncio.Semaphore(self._max_in_flight)
+                self._loop = asyncio.get_running_loop()
+                logger.info("AsyncHTTPClient session started")
+
+    def session_for_running_loop(self) -> Optional[aiohttp.ClientSession]:
+        """Return the pooled session if it was started on the running loop, else None."""
+        if self.session is None or self.session.closed or self._loop is not asyncio.get_running_loop():
+            return None
+        return self.session
 
     async def close(self):
         """Close the HTTP session."""
         if self.session:
             await self.session.close()
             self.session = None
+            self.connector = None
+            self._in_flight = None
+            self._loop = None
             logger.info("AsyncHTTPClient session closed")
 
     @asynccontextmanager
     async def request_context(self, method: str, url: str, **kwargs):
         """Context manager for making HTTP requests with automatic retry."""
-        if not self.session:
+        if self.session_for_running_loop() is None:
             await self.start()
+            if self.session_for_running_loop() is None:
+                # The session, connector and semaphore all belong to the loop that started them
+                raise RuntimeError("AsyncHTTPClient was started on a different event loop")
 
         max_retries = kwargs.pop('max_retries', 3)
         retry_delay = kwargs.pop('retry_delay', 1.0)
+        max_delay = kwargs.pop('max_delay', 30.0)
 
         for attempt in range(max_retries):
             try:
-                async with self.session.request(method, url, **kwargs) as response:
-                    yield response
+                async with self._in_flight:
+                    async with self.session.request(method, url, **kwargs) as response:
+                        yield response
                 break
             except (aiohttp.ClientError, asyncio.TimeoutError) as e:
                 if attempt < max_retries - 1:
-                    logger.warning(f"Request attempt {attempt + 1} failed: {e}, retrying in {retry_delay}s")
-                    await asyncio.sleep(retry_delay * (2 ** attempt))
+                    # Capped exponential backoff with +/-25% jitter so concurrent callers don't retry in lockstep
+                    delay = min(max_delay, retry_delay * (2 ** attempt)) * random.uniform(0.75, 1.25)
+                    logger.warning(f"Request attempt {attempt + 1} failed: {e}, retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
                 else:
                     logger.error(f"Request failed after {max_retries} attempts: {e}")
                     raise
@@ -106,7 +186,11 @@ def get_http_client() -> AsyncHTTPClient:
     return _http_client
 
 async def init_http_client():
-    """Initialize the global HTTP client."""
+    """Initialize the global HTTP client.
+
+    create_app() installs uvloop (see install_uvloop) before starting the worker
+    loop, so the client runs on the faster libuv loop where available.
+    """
     client = get_http_client()
     await client.start()
 
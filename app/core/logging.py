@@ -1,9 +1,22 @@
+import atexit
 import logging
 import logging.handlers
+import queue
 import sys
 import os
 from pathlib import Path
 
+# The formatter never prints thread/process fields, so skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+_FORMATTER = logging.Formatter(
+    '%(asctime)s.%(msecs)03d - %(name)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%dT%H:%M:%S',
+    style='%'
+)
+
 def setup_logging(config=None, level=None):
     """Configure logging for the application with rotation and proper error handling."""
     # Check if logging is already configured to avoid duplicate handlers
@@ -23,19 +36,20 @@ def setup_logging(config=None, level=None):
     logger = logging.getLogger()
     logger.setLevel(level)
 
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = []
 
     # Console handler
     ch = logging.StreamHandler(sys.stdout)
     ch.setLevel(level)
-    ch.setFormatter(formatter)
-    logger.addHandler(ch)
+    ch.setFormatter(_FORMATTER)
+    handlers.append(ch)
 
     # Rotating file handler
     log_dir = Path('logs')
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / os.getenv('LOG_FILE', 'app.log')
 
+    file_error = None
     try:
         fh = logging.handlers.RotatingFileHandler(
             log_file,
@@ -44,10 +58,20 @@ def setup_logging(config=None, level=None):
             encoding='utf-8'
         )
         fh.setLevel(getattr(logging, os.getenv('LOG_FILE_LEVEL', 'DEBUG').upper(), logging.DEBUG))
-        fh.setFormatter(formatter)
-        logger.addHandler(fh)
+        fh.setFormatter(_FORMATTER)
+        handlers.append(fh)
     except (OSError, PermissionError) as e:
-        logger.warning(f"Could not set up file logging: {e}. Continuing with console only.")
+        file_error = e
+
+    # Request handlers only enqueue records; formatting and I/O happen on the listener thread
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    if file_error:
+        logger.warning(f"Could not set up file logging: {file_error}. Continuing with console only.")
 
     # Suppress noisy loggers
     logging.getLogger('httpx').setLevel(logging.WARNING)
@@ -1,7 +1,13 @@
-from flask import jsonify
+import orjson
+from flask import current_app
 from typing import Any, Dict, Optional
 from app.core.errors import InterviewAppError
 
+def _json_response(obj: Dict[str, Any], status_code: int):
+    """Encode obj straight to JSON bytes with orjson, skipping the jsonify provider layer."""
+    body = orjson.dumps(obj, default=current_app.json.default, option=orjson.OPT_NON_STR_KEYS)
+    return current_app.response_class(body, status=status_code, mimetype="application/json")
+
 class APIResponse:
     """Standardized API response utilities."""
 
@@ -17,7 +23,7 @@ class APIResponse:
         if data is not None:
             response["data"] = data
 
-        return jsonify(response), status_code
+        return _json_response(response, status_code), status_code
 
     @staticmethod
     def error(
@@ -37,7 +43,7 @@ class APIResponse:
         if details:
             response["details"] = details
 
-        return jsonify(response), status_code
+        return _json_response(response, status_code), status_code
 
     @staticmethod
     def handle_exception(e: Exception) -> tuple:
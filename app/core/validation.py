@@ -1,7 +1,34 @@
 import re
+import uuid
 from typing import Dict, Any, List, Optional
 from app.core.errors import ValidationError
 
+# RFC 5322 compliant email regex (simplified)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_ROOM_RE = re.compile(r'^[a-zA-Z0-9_-]+$')
+
+def _strip_tags(value: str) -> str:
+    """Remove <...> tags in a single find()-driven pass (same result as re.sub(r'<[^>]+>', '', value))."""
+    start = value.find('<')
+    if start == -1:
+        return value
+
+    parts = []
+    pos = 0
+    while start != -1:
+        end = value.find('>', start + 1)
+        if end == -1:
+            break
+        if end == start + 1:
+            # "<>" is not a tag; keep it and look for the next '<'
+            start = value.find('<', end)
+            continue
+        parts.append(value[pos:start])
+        pos = end + 1
+        start = value.find('<', pos)
+    parts.append(value[pos:])
+    return ''.join(parts)
+
 class InputValidator:
     """Comprehensive input validation and sanitization utilities."""
 
@@ -11,12 +38,16 @@ class InputValidator:
         if not isinstance(value, str):
             raise ValidationError("Value must be a string")
 
-        # Remove null bytes and control characters
-        value = value.replace('\x00', '').strip()
+        # Clean input (the common case) only needs the strip; skip the scans below
+        if '\x00' not in value and '<' not in value:
+            value = value.strip()
+        else:
+            # Remove null bytes and control characters
+            value = value.replace('\x00', '').strip()
 
-        # Basic HTML sanitization if not allowed
-        if not allow_html:
-            value = re.sub(r'<[^>]+>', '', value)
+            # Basic HTML sanitization if not allowed
+            if not allow_html:
+                value = _strip_tags(value)
 
         # Length validation
         if len(value) > max_length:
@@ -29,10 +60,7 @@ class InputValidator:
         """Validate and sanitize email address."""
         email = InputValidator.sanitize_string(email, max_length=254)
 
-        # RFC 5322 compliant email regex (simplified)
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-        if not re.match(email_pattern, email):
+        if not _EMAIL_RE.match(email):
             raise ValidationError("Invalid email format")
 
         return email.lower()
@@ -80,9 +108,13 @@ class InputValidator:
         if not isinstance(session_id, str):
             raise ValidationError("Session ID must be a string")
 
-        # UUID format validation
-        uuid_pattern = r'^[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}$'
-        if not re.match(uuid_pattern, session_id):
+        # UUID format validation; uuid.UUID parses in C, and the round-trip
+        # check keeps only the canonical lowercase hyphenated form
+        try:
+            canonical = str(uuid.UUID(session_id))
+        except ValueError:
+            raise ValidationError("Invalid session ID format")
+        if canonical != session_id:
             raise ValidationError("Invalid session ID format")
 
         return session_id
@@ -93,7 +125,7 @@ class InputValidator:
         room_name = InputValidator.sanitize_string(room_name, max_length=100)
 
         # Allow alphanumeric, hyphens, and underscores
-        if not re.match(r'^[a-zA-Z0-9_-]+$', room_name):
+        if not _ROOM_RE.match(room_name):
             raise ValidationError("Room name contains invalid characters")
 
         return room_name
@@ -1,52 +1,118 @@
+import asyncio
 import io
 import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Optional, Union
+
+# Optional parsers, resolved once at import instead of on every extraction
+try:
+    import pypdfium2 as _pdfium
+except ImportError:
+    _pdfium = None
+
+try:
+    import PyPDF2 as _PyPDF2
+except ImportError:
+    _PyPDF2 = None
+
+try:
+    from docx import Document as _DocxDocument
+except ImportError:
+    _DocxDocument = None
 
 logger = logging.getLogger(__name__)
 
+# Uploads carry a JD and a resume, so a few workers cover concurrent requests
+_MAX_POOL_WORKERS = 4
+
+def _extract_in_worker(file_content: bytes, filename: str) -> str:
+    """Process pool entry point; module-level so it pickles without the service instance."""
+    return DocumentProcessingService().extract_text_from_file(file_content, filename)
+
 class DocumentProcessingService:
-    def extract_text_from_file(self, file_content: bytes, filename: str) -> str:
-        """Extract text from various document formats"""
+    # Shared across instances; worker processes are spawned on first use
+    _pool: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def _get_pool(cls) -> ProcessPoolExecutor:
+        if cls._pool is None:
+            # Spawn rather than fork: the server process runs the worker loop, log
+            # listener and server threads, and a forked child would also inherit the
+            # QueueHandler without its listener and lose its log records
+            cls._pool = ProcessPoolExecutor(
+                max_workers=min(_MAX_POOL_WORKERS, os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return cls._pool
+
+    async def extract_text_from_file_async(self, file_content: bytes, filename: str) -> str:
+        """Extract text in a worker process so PDF/DOCX parsing doesn't block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_pool(), _extract_in_worker, file_content, filename)
+
+    def extract_text_from_file(self, file_content: Union[bytes, BinaryIO], filename: str) -> str:
+        """Extract text from various document formats.
+
+        Accepts raw bytes or a seekable binary file object, which is handed
+        to the parsers as-is instead of being copied into memory first.
+        """
+        # BytesIO over bytes shares the buffer; file objects are used directly
+        if isinstance(file_content, (bytes, bytearray)):
+            file_obj = io.BytesIO(file_content)
+        else:
+            file_obj = file_content
+
         try:
             # Handle text files
             if filename.endswith('.txt'):
-                return file_content.decode('utf-8', errors='ignore')
+                return file_obj.read().decode('utf-8', errors='ignore')
 
             # Handle PDF files
             elif filename.endswith('.pdf'):
-                try:
-                    import PyPDF2
-                    pdf_file = io.BytesIO(file_content)
-                    pdf_reader = PyPDF2.PdfReader(pdf_file)
-
-                    text = ""
-                    for page in pdf_reader.pages:
-                        text += page.extract_text() + "\n"
+                # Prefer PDFium's native text layer; PyPDF2 is the pure-Python fallback
+                if _pdfium is not None:
+                    try:
+                        pdf = _pdfium.PdfDocument(file_obj)
+                        try:
+                            pages = []
+                            for page in pdf:
+                                textpage = page.get_textpage()
+                                pages.append(textpage.get_text_range())
+                                textpage.close()
+                                page.close()
+                            return "\n".join(pages).strip()
+                        finally:
+                            pdf.close()
+                    except Exception as e:
+                        logger.warning(f"pypdfium2 PDF processing failed, falling back to PyPDF2: {e}")
 
-                    return text.strip()
-
-                except ImportError:
+                if _PyPDF2 is None:
                     logger.error("PyPDF2 not available for PDF processing")
                     return "PDF text extraction failed - PyPDF2 not available"
+
+                try:
+                    file_obj.seek(0)
+                    pdf_reader = _PyPDF2.PdfReader(file_obj)
+
+                    return "\n".join(page.extract_text() or "" for page in pdf_reader.pages).strip()
+
                 except Exception as e:
                     logger.error(f"PDF processing error: {e}")
                     return f"PDF text extraction failed: {str(e)}"
 
             # Handle DOCX files
             elif filename.endswith('.docx'):
-                try:
-                    from docx import Document
-                    docx_file = io.BytesIO(file_content)
-                    doc = Document(docx_file)
+                if _DocxDocument is None:
+                    logger.error("python-docx not available for DOCX processing")
+                    return "DOCX text extraction failed - python-docx not available"
 
-                    text = ""
-                    for paragraph in doc.paragraphs:
-                        text += paragraph.text + "\n"
+                try:
+                    doc = _DocxDocument(file_obj)
 
-                    return text.strip()
+                    return "\n".join(paragraph.text for paragraph in doc.paragraphs).strip()
 
-                except ImportError:
-                    logger.error("python-docx not available for DOCX processing")
-                    return "DOCX text extraction failed - python-docx not available"
                 except Exception as e:
                     logger.error(f"DOCX processing error: {e}")
                     return f"DOCX text extraction failed: {str(e)}"
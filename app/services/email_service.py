@@ -1,15 +1,22 @@
-import smtplib
+import asyncio
+import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
 from email import encoders
 import logging
-from typing import List
-import os
 import time
+from typing import List, Optional, Tuple
+import os
 
 logger = logging.getLogger(__name__)
 
+# Candidate and HR copies of a report go out in parallel, one session each
+_SMTP_POOL_SIZE = 2
+# Servers drop idle sessions after a few minutes, so reconnect rather than send on
+# one that has sat unused this long
+_SMTP_IDLE_TIMEOUT = 240  # seconds
+
 class EmailService:
     def __init__(self, smtp_server: str = None, smtp_port: int = None, username: str = None, password: str = None, use_tls: bool = True):
         # Load from environment if not provided
@@ -29,7 +36,61 @@ class EmailService:
             self.configured = True
             logger.info("Email service configured successfully")
 
-    def send_email(self, subject: str, body: str, from_addr: str, to_addrs: List[str], html: bool = False) -> bool:
+        # Authenticated SMTP sessions reused across sends, one lock per session so
+        # messages on the same connection don't interleave
+        self._smtp: List[Optional[aiosmtplib.SMTP]] = [None] * _SMTP_POOL_SIZE
+        self._smtp_last_used = [0.0] * _SMTP_POOL_SIZE
+        self._smtp_locks = [asyncio.Lock() for _ in range(_SMTP_POOL_SIZE)]
+
+    async def _get_smtp(self, slot: int) -> aiosmtplib.SMTP:
+        """Return the open SMTP session for slot, connecting and logging in if needed."""
+        smtp = self._smtp[slot]
+        if smtp is not None and smtp.is_connected:
+            if time.monotonic() - self._smtp_last_used[slot] < _SMTP_IDLE_TIMEOUT:
+                return smtp
+            # Likely timed out on the server side; drop the transport without a QUIT
+            # round trip and reconnect
+            smtp.close()
+
+        smtp = aiosmtplib.SMTP(hostname=self.smtp_server, port=self.smtp_port, start_tls=self.use_tls)
+        await smtp.connect()
+        await smtp.login(self.username, self.password)
+        self._smtp[slot] = smtp
+        self._smtp_last_used[slot] = time.monotonic()
+        return smtp
+
+    async def _send_on(self, slot: int, msg: MIMEMultipart, sender: str, recipients: List[str]):
+        """Send one message over the SMTP session in slot."""
+        async with self._smtp_locks[slot]:
+            try:
+                smtp = await self._get_smtp(slot)
+                await smtp.send_message(msg, sender=sender, recipients=recipients)
+                self._smtp_last_used[slot] = time.monotonic()
+            except aiosmtplib.SMTPServerDisconnected:
+                # Drop the stale session so the next attempt reconnects
+                self._smtp[slot] = None
+                raise
+
+    async def _send_messages(self, messages: List[Tuple[MIMEMultipart, str, List[str]]]):
+        """Send (message, sender, recipients) tuples concurrently across the pooled sessions."""
+        await asyncio.gather(*(
+            self._send_on(index % _SMTP_POOL_SIZE, msg, sender, recipients)
+            for index, (msg, sender, recipients) in enumerate(messages)
+        ))
+
+    async def close(self):
+        """Close the cached SMTP sessions."""
+        for slot, lock in enumerate(self._smtp_locks):
+            async with lock:
+                if self._smtp[slot] is not None:
+                    try:
+                        await self._smtp[slot].quit()
+                    except Exception as e:
+                        logger.warning(f"Error closing SMTP server: {e}")
+                    finally:
+                        self._smtp[slot] = None
+
+    async def send_email(self, subject: str, body: str, from_addr: str, to_addrs: List[str], html: bool = False) -> bool:
         """Send an email with optional HTML content and retry logic."""
         msg = MIMEMultipart()
         msg['From'] = from_addr
@@ -44,23 +105,19 @@ class EmailService:
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                    if self.use_tls:
-                        server.starttls()
-                    server.login(self.username, self.password)
-                    server.sendmail(from_addr, to_addrs, msg.as_string())
+                await self._send_messages([(msg, from_addr, to_addrs)])
 
                 logger.info(f"Email sent to {to_addrs} with subject '{subject}'")
                 return True
             except Exception as e:
                 logger.warning(f"Email send attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"Failed to send email after {max_retries} attempts: {e}")
                     return False
 
-    def send_interview_report(self, candidate_email: str, report_content: str) -> bool:
+    async def send_interview_report(self, candidate_email: str, report_content: str) -> bool:
         """Send interview report to both candidate and HR with retry logic"""
         if not self.configured:
             logger.warning("Email service not configured - report not sent")
@@ -106,20 +163,13 @@ class EmailService:
 
         max_retries = 3
         for attempt in range(max_retries):
-            server = None
             try:
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                server.starttls()
-                server.login(self.sender_email, self.password)
-
-                # Send to candidate
-                candidate_text = candidate_msg.as_string()
-                server.sendmail(self.sender_email, candidate_email, candidate_text)
+                # Candidate and HR copies are sent concurrently on separate sessions
+                await self._send_messages([
+                    (candidate_msg, self.sender_email, [candidate_email]),
+                    (hr_msg, self.sender_email, [self.hr_email]),
+                ])
                 logger.info(f"✅ Interview report sent to candidate: {candidate_email}")
-
-                # Send to HR
-                hr_text = hr_msg.as_string()
-                server.sendmail(self.sender_email, self.hr_email, hr_text)
                 logger.info(f"✅ Interview report sent to HR: {self.hr_email}")
 
                 return True
@@ -127,18 +177,12 @@ class EmailService:
             except Exception as e:
                 logger.warning(f"Interview report send attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"❌ Failed to send interview report after {max_retries} attempts: {e}")
                     return False
-            finally:
-                if server:
-                    try:
-                        server.quit()
-                    except Exception as e:
-                        logger.warning(f"Error closing SMTP server: {e}")
 
-    def send_interview_report_with_pdf(self, candidate_email: str, pdf_data: bytes, session_id: str) -> bool:
+    async def send_interview_report_with_pdf(self, candidate_email: str, pdf_data: bytes, session_id: str) -> bool:
         """Send interview report as PDF attachment to both candidate and HR"""
         if not self.configured:
             logger.warning("Email service not configured - report not sent")
@@ -169,12 +213,14 @@ class EmailService:
         """
         candidate_msg.attach(MIMEText(candidate_body, 'html'))
 
+        # Base64-encode the PDF once; the same read-only part is attached to both emails
+        pdf_attachment = MIMEBase('application', 'octet-stream')
+        pdf_attachment.set_payload(pdf_data)
+        encoders.encode_base64(pdf_attachment)
+        pdf_attachment.add_header('Content-Disposition', 'attachment', filename=f'interview_report_{session_id}.pdf')
+
         # Attach PDF to candidate email
-        candidate_pdf_attachment = MIMEBase('application', 'octet-stream')
-        candidate_pdf_attachment.set_payload(pdf_data)
-        encoders.encode_base64(candidate_pdf_attachment)
-        candidate_pdf_attachment.add_header('Content-Disposition', 'attachment', filename=f'interview_report_{session_id}.pdf')
-        candidate_msg.attach(candidate_pdf_attachment)
+        candidate_msg.attach(pdf_attachment)
 
         # Create HR message
         hr_msg = MIMEMultipart()
@@ -197,28 +243,17 @@ class EmailService:
         hr_msg.attach(MIMEText(hr_body, 'html'))
 
         # Attach PDF to HR email
-        hr_pdf_attachment = MIMEBase('application', 'octet-stream')
-        hr_pdf_attachment.set_payload(pdf_data)
-        encoders.encode_base64(hr_pdf_attachment)
-        hr_pdf_attachment.add_header('Content-Disposition', 'attachment', filename=f'interview_report_{session_id}.pdf')
-        hr_msg.attach(hr_pdf_attachment)
+        hr_msg.attach(pdf_attachment)
 
         max_retries = 3
         for attempt in range(max_retries):
-            server = None
             try:
-                server = smtplib.SMTP(self.smtp_server, self.smtp_port)
-                server.starttls()
-                server.login(self.sender_email, self.password)
-
-                # Send to candidate
-                candidate_text = candidate_msg.as_string()
-                server.sendmail(self.sender_email, candidate_email, candidate_text)
+                # Candidate and HR copies are sent concurrently on separate sessions
+                await self._send_messages([
+                    (candidate_msg, self.sender_email, [candidate_email]),
+                    (hr_msg, self.sender_email, [self.hr_email]),
+                ])
                 logger.info(f"✅ Interview report PDF sent to candidate: {candidate_email}")
-
-                # Send to HR
-                hr_text = hr_msg.as_string()
-                server.sendmail(self.sender_email, self.hr_email, hr_text)
                 logger.info(f"✅ Interview report PDF sent to HR: {self.hr_email}")
 
                 return True
@@ -226,13 +261,7 @@ class EmailService:
             except Exception as e:
                 logger.warning(f"Interview report PDF send attempt {attempt + 1} failed: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
                 else:
                     logger.error(f"❌ Failed to send interview report PDF after {max_retries} attempts: {e}")
                     return False
-            finally:
-                if server:
-                    try:
-                        server.quit()
-                    except Exception as e:
-                        logger.warning(f"Error closing SMTP server: {e}")
@@ -1,33 +1,337 @@
 import asyncio
+import functools
+import hashlib
 import logging
 import os
 import json
+import orjson
 import re
-from typing import List, Dict, Any
-from livekit.plugins import openai
-from livekit.agents import ChatContext
+import time
+import httpx
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, AsyncIterator
+from openai import AsyncOpenAI
 from pathlib import Path
-from app.core.http_client import get_http_client
+
+try:
+    import tiktoken as _tiktoken
+except ImportError:
+    _tiktoken = None
 
 logger = logging.getLogger(__name__)
 
+_LLM_MODEL = "gpt-4o-mini"
+
+# Prompt budgets in tokens: (head, tail) kept from each document. The JD front-loads
+# its requirements; the resume keeps both its summary and its closing skills section
+_JD_BUDGET = (1000, 0)
+_RESUME_BUDGET = (600, 400)
+_ANALYSIS_JD_BUDGET = (500, 0)
+_ANALYSIS_RESUME_BUDGET = (300, 200)
+# Resume excerpt sent alongside a precomputed analysis, which already distills skills and gaps
+_RESUME_EXCERPT_BUDGET = (300, 0)
+_CHARS_PER_TOKEN = 4  # estimate used when no tokenizer is available
+_WHITESPACE_RE = re.compile(r'\s+')
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    """Load the model's tokenizer once; None if tiktoken is unavailable."""
+    if _tiktoken is None:
+        return None
+    try:
+        return _tiktoken.encoding_for_model(_LLM_MODEL)
+    except Exception as e:
+        logger.warning(f"Tokenizer unavailable, truncating by characters: {e}")
+        return None
+
+# The same JD/resume is truncated for every prompt built from it; memoize so
+# repeat calls skip the whitespace pass and re-encoding
+@functools.lru_cache(maxsize=64)
+def _budget_truncate(text: str, budget: tuple) -> str:
+    """Collapse whitespace and keep the first/last (head, tail) tokens of text."""
+    head, tail = budget
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+    encoding = _get_encoding()
+    if encoding is None:
+        head, tail = head * _CHARS_PER_TOKEN, tail * _CHARS_PER_TOKEN
+        if len(text) <= head + tail:
+            return text
+        return text[:head] + (' ... ' + text[-tail:] if tail else '')
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= head + tail:
+        return text
+    return encoding.decode(tokens[:head]) + (' ... ' + encoding.decode(tokens[-tail:]) if tail else '')
+
+# LLM responses keyed by a hash of the prompt (which embeds the truncated JD/resume
+# and question count), so re-runs over the same documents skip the LLM round trip
+_COMPLETION_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_COMPLETION_CACHE_TTL = 3600  # seconds
+_COMPLETION_CACHE_SIZE = 256
+
+def _completion_key(prompt: str, options: Dict[str, Any]) -> str:
+    payload = prompt + '\x00' + json.dumps(options, sort_keys=True)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def _cached_completion(key: str) -> Optional[str]:
+    """Return a fresh cached response for key, or None."""
+    cached = _COMPLETION_CACHE.get(key)
+    if cached and time.monotonic() - cached[0] < _COMPLETION_CACHE_TTL:
+        _COMPLETION_CACHE.move_to_end(key)
+        logger.info("Using cached LLM response")
+        return cached[1]
+    return None
+
+def _store_completion(key: str, text: str):
+    _COMPLETION_CACHE[key] = (time.monotonic(), text)
+    _COMPLETION_CACHE.move_to_end(key)
+    while len(_COMPLETION_CACHE) > _COMPLETION_CACHE_SIZE:
+        _COMPLETION_CACHE.popitem(last=False)
+
+def _evict_completion(prompt: str, **options):
+    """Drop a cached response that turned out to be unusable."""
+    _COMPLETION_CACHE.pop(_completion_key(prompt, options), None)
+
+_JSON_BLOCK_RE = re.compile(r'```json\s*(.*?)\s*```', re.DOTALL)
+# One response line: any run of list markers ("1." / "1)", bullets, "Q:"), an optional
+# quote, then the question text in group 1
+_Q_LINE_RE = re.compile(r'^[ \t]*(?:(?:\d+[.)]|[-•*]|Q:|Question:)[ \t]*)*"?(.+?)"?[ \t\r]*$', re.MULTILINE)
+_NON_QUESTION_PREFIXES = ('here', 'below', 'above', 'note')
+# Error message fragments that mark an LLM request as interrupted and worth retrying
+_TRANSIENT_LLM_ERRORS = ("event loop is closed", "cancelled", "connection", "timeout")
+
+def _is_question(text: str) -> bool:
+    """Filter out very short questions and non-questions."""
+    return len(text) > 10 and '?' in text and not text.lower().startswith(_NON_QUESTION_PREFIXES)
+
+def _parse_question_line(line: str) -> Optional[str]:
+    """Return the question on a single LLM response line, or None if it holds none."""
+    match = _Q_LINE_RE.match(line)
+    return match.group(1) if match and _is_question(match.group(1)) else None
+
+def _parse_questions(text: str) -> List[str]:
+    """Extract question strings from a numbered/bulleted LLM response in one regex pass."""
+    return [q for q in _Q_LINE_RE.findall(text) if _is_question(q)]
+
+# Generic questions used when the LLM is unavailable
+_FALLBACK_QUESTIONS = (
+    "Can you walk me through your professional background and key experiences?",
+    "What motivated you to apply for this position?",
+    "Can you describe a challenging project you've worked on and how you handled it?",
+    "How do you approach problem-solving in your work?",
+    "What are your greatest professional strengths?",
+    "Can you tell me about a time when you had to learn something new quickly?",
+    "How do you handle working under pressure or meeting tight deadlines?",
+    "Describe your experience working in a team environment.",
+    "What tools and technologies are you most proficient with?",
+    "How do you stay current with industry trends and best practices?",
+    "Can you discuss a situation where you received constructive feedback and how you responded?",
+    "What are your career goals and how does this position align with them?",
+    "How do you prioritize tasks when working on multiple projects?",
+    "Can you describe your experience with project management or coordination?",
+    "What do you consider to be your most significant professional achievement?",
+    "How do you handle conflicts or disagreements in a professional setting?",
+    "What experience do you have with quality assurance or testing processes?",
+    "How do you approach documentation and knowledge sharing?",
+    "Can you discuss your experience with stakeholder communication?",
+    "What strategies do you use for continuous professional development?",
+)
+_FALLBACK_QUESTION_DICTS = tuple(
+    {"id": i+1, "question": question} for i, question in enumerate(_FALLBACK_QUESTIONS)
+)
+
+# Static system message sent ahead of every prompt; keep it byte-identical between
+# calls so OpenAI's automatic prompt caching can reuse the prefix
+_INTERVIEW_SYSTEM_PROMPT = """You are an expert technical interviewer with years of experience conducting interviews for software development and technical roles. Your task is to assess how well a candidate's resume matches the job description provided and to generate highly relevant, specific interview questions based on them."""
+
+def _chat_messages(prompt: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
+    if system_prompt is None:
+        return [{"role": "user", "content": prompt}]
+    return [{"role": "system", "content": system_prompt}, {"role": "user", "content": prompt}]
+
+def _build_questions_prompt(jd_text: str, resume_text: str, num_questions: int,
+                            analysis: Optional[Dict[str, Any]] = None) -> str:
+    """Build the question-generation user prompt for a JD/resume pair.
+
+    When a match analysis is already available its skills and gaps stand in for
+    most of the resume, so only a short excerpt is sent.
+    """
+    if isinstance(analysis, dict) and analysis:
+        summary = orjson.dumps({
+            key: analysis[key] for key in ("match_score", "key_skills", "gaps", "assessment") if key in analysis
+        }).decode()
+        candidate = f"""CANDIDATE ANALYSIS:
+{summary}
+
+CANDIDATE RESUME (EXCERPT):
+{_budget_truncate(resume_text, _RESUME_EXCERPT_BUDGET)}"""
+    else:
+        candidate = f"""CANDIDATE RESUME:
+{_budget_truncate(resume_text, _RESUME_BUDGET)}"""
+    return f"""
+Analyze the following job description and candidate resume carefully, then generate {num_questions} targeted interview questions.
+
+JOB DESCRIPTION:
+{_budget_truncate(jd_text, _JD_BUDGET)}
+
+{candidate}
+
+INSTRUCTIONS:
+Generate {num_questions} thoughtful, specific interview questions that directly relate to:
+1. Skills and technologies mentioned in both the job description and resume
+2. Experience levels required by the JD and demonstrated in the resume
+3. Specific projects or achievements from the resume that align with JD requirements
+4. Gaps between JD requirements and resume experience (if any)
+5. Problem-solving approaches relevant to the role
+6. Technical concepts and methodologies from the JD that the candidate should know
+
+REQUIREMENTS:
+- Questions must reference specific skills, tools, or experiences from the resume/JD
+- Make questions conversational and natural for a professional interview
+- Include follow-up potential in questions
+- Avoid generic questions; be specific to this candidate and role
+- Balance technical and behavioral questions
+- Ensure questions assess real job requirements, not just resume keywords
+- ALL QUESTIONS MUST BE IN ENGLISH ONLY
+
+FORMAT: Return ONLY a numbered list:
+1. Question one?
+2. Question two?
+3. Continue exactly like this...
+
+No introductions, explanations, or extra text.
+"""
+
+# Pooled HTTP connections to OpenAI shared by every InterviewService instance
+_openai_http_client: Optional[httpx.AsyncClient] = None
+
+def _get_openai_http_client() -> httpx.AsyncClient:
+    global _openai_http_client
+    if _openai_http_client is None:
+        # HTTP/2 multiplexes concurrent completions over a few kept-alive connections
+        _openai_http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=500, max_keepalive_connections=100),
+            timeout=httpx.Timeout(60.0, connect=10.0)
+        )
+    return _openai_http_client
+
+# One AsyncOpenAI client for the process; every InterviewService reuses it (and its
+# connection pool) instead of re-parsing config and building a new client
+_llm_client: Optional[AsyncOpenAI] = None
+
+def _get_llm_client(api_key: str) -> AsyncOpenAI:
+    global _llm_client
+    if _llm_client is None:
+        _llm_client = AsyncOpenAI(api_key=api_key, http_client=_get_openai_http_client())
+        logger.info("OpenAI client initialized successfully")
+    return _llm_client
+
 class InterviewService:
     """Service for interview-related operations like analysis and question generation."""
 
     def __init__(self):
         self.openai_key = os.getenv("OPENAI_API_KEY")
-        self.llm = None
+        self.llm: Optional[AsyncOpenAI] = None
         if not self.openai_key:
             logger.warning("OpenAI API key not found - using fallback methods")
         else:
             try:
-                self.llm = openai.LLM(model="gpt-4o-mini", api_key=self.openai_key)
-                logger.info("LiveKit OpenAI LLM plugin initialized successfully")
+                self.llm = _get_llm_client(self.openai_key)
             except Exception as e:
-                logger.error(f"LLM plugin initialization failed: {e}")
+                logger.error(f"OpenAI client initialization failed: {e}")
                 self.llm = None
 
-    async def analyze_documents(self, jd_text: str, resume_text: str) -> Dict[str, Any]:
+    async def warm_up(self):
+        """Load the tokenizer and open a pooled connection to OpenAI so the first real
+        request skips both the BPE load and the TLS handshake."""
+        await asyncio.get_running_loop().run_in_executor(None, _get_encoding)
+        if not self.llm:
+            return
+        try:
+            await self.llm.models.retrieve(_LLM_MODEL)
+            logger.info("OpenAI connection warmed up")
+        except Exception as e:
+            logger.warning(f"OpenAI warm-up failed: {e}")
+
+    async def _complete(self, prompt: str, skip_cache: bool = False, system_prompt: Optional[str] = None, **kwargs) -> str:
+        """Stream a chat completion for prompt and return the full response text.
+
+        Responses are cached for _COMPLETION_CACHE_TTL seconds; pass skip_cache=True
+        to always query the model (the fresh response still refreshes the cache).
+        """
+        key = _completion_key(prompt, dict(kwargs, system_prompt=system_prompt))
+        cached = None if skip_cache else _cached_completion(key)
+        if cached is not None:
+            return cached
+
+        stream = await self.llm.chat.completions.create(
+            model=_LLM_MODEL,
+            messages=_chat_messages(prompt, system_prompt),
+            stream=True,
+            **kwargs
+        )
+        parts = []
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+        text = "".join(parts)
+
+        _store_completion(key, text)
+        return text
+
+    async def _stream_questions(self, prompt: str, num_questions: int, skip_cache: bool = False) -> AsyncIterator[str]:
+        """Yield questions as their lines arrive from the LLM.
+
+        The stream is closed as soon as num_questions have been parsed, so trailing
+        commentary is never downloaded. Cached responses are parsed directly.
+        """
+        key = _completion_key(prompt, {"system_prompt": _INTERVIEW_SYSTEM_PROMPT})
+        cached = None if skip_cache else _cached_completion(key)
+        if cached is not None:
+            for question in _parse_questions(cached)[:num_questions]:
+                yield question
+            return
+
+        stream = await self.llm.chat.completions.create(
+            model=_LLM_MODEL,
+            messages=_chat_messages(prompt, _INTERVIEW_SYSTEM_PROMPT),
+            stream=True
+        )
+        parts = []
+        pending = ""
+        count = 0
+        finished = False
+        try:
+            async for chunk in stream:
+                if not (chunk.choices and chunk.choices[0].delta.content):
+                    continue
+                content = chunk.choices[0].delta.content
+                parts.append(content)
+                pending += content
+                if '\n' not in content:
+                    continue
+                *lines, pending = pending.split('\n')
+                for line in lines:
+                    question = _parse_question_line(line)
+                    if question:
+                        count += 1
+                        yield question
+                        if count >= num_questions:
+                            finished = True
+                            return
+            question = _parse_question_line(pending)
+            if question:
+                yield question
+            finished = True
+        finally:
+            await stream.close()
+            if finished:
+                # The (possibly truncated) text still parses to the same questions
+                _store_completion(key, "".join(parts))
+                logger.info(f"LLM response received, length: {sum(map(len, parts))} characters")
+
+    async def analyze_documents(self, jd_text: str, resume_text: str, skip_cache: bool = False) -> Dict[str, Any]:
         """Analyze documents with AI"""
         try:
             # Basic analysis if OpenAI not available
@@ -38,10 +342,10 @@ class InterviewService:
 Analyze the following job description and resume to determine how well the candidate matches the position.
 
 Job Description:
-{jd_text[:2000]}
+{_budget_truncate(jd_text, _ANALYSIS_JD_BUDGET)}
 
 Resume:
-{resume_text[:2000]}
+{_budget_truncate(resume_text, _ANALYSIS_RESUME_BUDGET)}
 
 Please provide:
 1. A match score from 1-10 (10 being perfect match)
@@ -52,15 +356,7 @@ Please provide:
 Format as JSON with keys: match_score, key_skills (array), gaps (array), assessment (string)
 """
 
-            # Use LiveKit LLM plugin
-            chat_ctx = ChatContext()
-            chat_ctx.add_message(role="user", content=prompt)
-
-            analysis_text = ""
-            async with self.llm.chat(chat_ctx=chat_ctx) as stream:
-                async for chunk in stream:
-                    if chunk.delta and hasattr(chunk.delta, 'content'):
-                        analysis_text += chunk.delta.content or ""
+            analysis_text = await self._complete(prompt, skip_cache=skip_cache, system_prompt=_INTERVIEW_SYSTEM_PROMPT)
             return self._parse_analysis_response(analysis_text)
 
         except Exception as e:
@@ -82,13 +378,13 @@ Format as JSON with keys: match_score, key_skills (array), gaps (array), assessm
         # Strip markdown code blocks if present
         if "```json" in response_text:
             # Extract content between ```json and ```
-            match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
+            match = _JSON_BLOCK_RE.search(response_text)
             if match:
                 response_text = match.group(1).strip()
 
         try:
             # Try to parse as JSON
-            parsed = json.loads(response_text)
+            parsed = orjson.loads(response_text)
             # Ensure required keys are present
             result = {
                 "match_score": parsed.get("match_score", 7),
@@ -97,7 +393,7 @@ Format as JSON with keys: match_score, key_skills (array), gaps (array), assessm
                 "assessment": parsed.get("assessment", response_text)
             }
             return result
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             # If not JSON, treat as plain text assessment
             logger.warning("LLM response is not valid JSON, using fallback parsing")
             return {
@@ -110,207 +406,132 @@ Format as JSON with keys: match_score, key_skills (array), gaps (array), assessm
             logger.error(f"Error parsing analysis response: {e}")
             return self._basic_analysis("", "")
 
-    async def generate_interview_questions(self, jd_text: str, resume_text: str, num_questions: int) -> List[Dict[str, Any]]:
-        """Generate interview questions using LLM based on resume and job description"""
+    async def generate_interview_questions(self, jd_text: str, resume_text: str, num_questions: int, skip_cache: bool = False,
+                                           analysis: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+        """Generate interview questions using LLM based on resume and job description.
+
+        Pass the result of analyze_documents as analysis to send it in place of most of the resume.
+        """
         try:
             if not self.llm:
                 logger.warning("LLM not available, using fallback questions")
                 return self._generate_fallback_questions(num_questions)
 
-            # Create prompt for LLM
-            system_prompt = """You are an expert technical interviewer with years of experience conducting interviews for software development and technical roles. Your task is to generate highly relevant, specific interview questions based on the candidate's resume and the job description provided."""
-            user_prompt = f"""
-Analyze the following job description and candidate resume carefully, then generate {num_questions} targeted interview questions.
-
-JOB DESCRIPTION:
-{jd_text[:4000]}
-
-CANDIDATE RESUME:
-{resume_text[:4000]}
-
-INSTRUCTIONS:
-Generate {num_questions} thoughtful, specific interview questions that directly relate to:
-1. Skills and technologies mentioned in both the job description and resume
-2. Experience levels required by the JD and demonstrated in the resume
-3. Specific projects or achievements from the resume that align with JD requirements
-4. Gaps between JD requirements and resume experience (if any)
-5. Problem-solving approaches relevant to the role
-6. Technical concepts and methodologies from the JD that the candidate should know
-
-REQUIREMENTS:
-- Questions must reference specific skills, tools, or experiences from the resume/JD
-- Make questions conversational and natural for a professional interview
-- Include follow-up potential in questions
-- Avoid generic questions; be specific to this candidate and role
-- Balance technical and behavioral questions
-- Ensure questions assess real job requirements, not just resume keywords
-- ALL QUESTIONS MUST BE IN ENGLISH ONLY
-
-FORMAT: Return ONLY a numbered list:
-1. Question one?
-2. Question two?
-3. Continue exactly like this...
+            # Generate questions using the OpenAI client
+            logger.info(f"Calling LLM API for {num_questions} questions")
+            user_prompt = _build_questions_prompt(jd_text, resume_text, num_questions, analysis)
 
-No introductions, explanations, or extra text.
-"""
+            questions = await self._run_and_parse(user_prompt, num_questions, skip_cache=skip_cache)
 
-            # Generate questions using LiveKit LLM plugin
-            logger.info(f"Calling LLM API for {num_questions} questions")
-            full_prompt = f"{system_prompt}\n\n{user_prompt}"
+            # Format questions with proper structure
+            return [{"id": i+1, "question": question} for i, question in enumerate(questions[:num_questions])]
 
-            chat_ctx = ChatContext()
-            chat_ctx.add_message(role="user", content=full_prompt)
+        except Exception as e:
+            logger.error(f"Error generating questions with LLM: {e}")
+            return self._generate_fallback_questions(num_questions)
 
-            questions_text = ""
+    async def _run_and_parse(self, prompt: str, num_questions: int, skip_cache: bool = False,
+                             attempts: int = 2, backoff: float = 1.0) -> List[str]:
+        """Query the LLM for questions and parse them, retrying interrupted requests with backoff."""
+        for attempt in range(attempts):
             try:
-                async with self.llm.chat(chat_ctx=chat_ctx) as stream:
-                    async for chunk in stream:
-                        if chunk.delta and hasattr(chunk.delta, 'content'):
-                            questions_text += chunk.delta.content or ""
-                logger.info(f"LLM response received, length: {len(questions_text)} characters")
+                # A retry always goes to the model; the failed attempt cached nothing
+                questions = [q async for q in self._stream_questions(
+                    prompt, num_questions, skip_cache=skip_cache or attempt > 0)]
+                break
             except (RuntimeError, asyncio.CancelledError, Exception) as e:
                 error_msg = str(e).lower()
-                if any(keyword in error_msg for keyword in ["event loop is closed", "cancelled", "connection", "timeout"]):
-                    logger.warning(f"LLM request interrupted ({type(e).__name__}: {e}), will retry question generation")
-                    # Wait a moment and retry once
-                    await asyncio.sleep(1.0)
-                    try:
-                        # Retry the LLM call with the same prompt
-                        chat_ctx = ChatContext()
-                        chat_ctx.add_message(role="user", content=full_prompt)
-
-                        questions_text = ""
-                        async with self.llm.chat(chat_ctx=chat_ctx) as stream:
-                            async for chunk in stream:
-                                if chunk.delta and hasattr(chunk.delta, 'content'):
-                                    questions_text += chunk.delta.content or ""
-
-                        # Parse questions from retry response
-                        questions = []
-                        lines = questions_text.split('\n')
-
-                        for line in lines:
-                            line = line.strip()
-                            if not line:
-                                continue
-
-                            question = None
-                            if line[0].isdigit() and len(line) > 2:
-                                parts = line.split('.', 1)
-                                if len(parts) > 1:
-                                    question = parts[1].strip()
-                                else:
-                                    question = line
-
-                            if question:
-                                question = question.strip(' -"')
-                                question = question.lstrip('0123456789.-•* ')
-                                question = question.strip()
-
-                                if (question and len(question) > 10 and
-                                    '?' in question and
-                                    not question.lower().startswith(('here', 'below', 'above', 'note'))):
-                                    questions.append(question)
-
-                        if questions:
-                            # Format questions with proper structure
-                            return [{"id": i+1, "question": question} for i, question in enumerate(questions[:num_questions])]
-
-                        raise Exception("Retry parsing failed to extract valid questions")
-
-                    except Exception as retry_e:
-                        logger.error(f"Retry also failed: {retry_e}, cannot generate questions without LLM")
-                        raise RuntimeError("Cannot generate interview questions due to persistent LLM connection issues. Please check your OpenAI API key and network connection.")
-                else:
+                transient = any(keyword in error_msg for keyword in _TRANSIENT_LLM_ERRORS)
+                if not transient:
                     logger.error(f"Unexpected error during LLM call: {e}")
-                    raise  # Re-raise unexpected errors
+                    raise
+                if attempt == attempts - 1:
+                    logger.error(f"Retry also failed: {e}, cannot generate questions without LLM")
+                    raise RuntimeError("Cannot generate interview questions due to persistent LLM connection issues. Please check your OpenAI API key and network connection.")
+                logger.warning(f"LLM request interrupted ({type(e).__name__}: {e}), will retry question generation")
+                await asyncio.sleep(backoff * (2 ** attempt))
+
+        # Log parsing results
+        logger.info(f"Successfully parsed {len(questions)} questions from LLM response")
+
+        # Ensure we have the requested number of questions - if not enough, raise error
+        if len(questions) < num_questions:
+            _evict_completion(prompt, system_prompt=_INTERVIEW_SYSTEM_PROMPT)
+            logger.error(f"LLM generated only {len(questions)} questions, but {num_questions} were requested. Cannot proceed without sufficient AI-generated questions.")
+            raise RuntimeError(f"LLM could not generate enough questions ({len(questions)}/{num_questions}). Please check your OpenAI API key and try again.")
+
+        return questions
+
+    async def analyze_and_generate(self, jd_text: str, resume_text: str, num_questions: int, skip_cache: bool = False) -> Dict[str, Any]:
+        """Analyze documents and generate interview questions in a single LLM call.
+
+        Sends the JD/resume context once and asks for one JSON object holding both
+        the match analysis and the questions. Falls back to the separate
+        analyze_documents/generate_interview_questions calls if that fails.
+        """
+        if not self.llm:
+            return {
+                "analysis": self._basic_analysis(jd_text, resume_text),
+                "questions": self._generate_fallback_questions(num_questions)
+            }
 
-            # Extract questions from the response with improved parsing
-            questions = []
-            lines = questions_text.split('\n')
+        prompt = f"""
+Analyze how well the candidate's resume matches the job description, then generate {num_questions} targeted interview questions.
 
-            for line in lines:
-                line = line.strip()
+JOB DESCRIPTION:
+{_budget_truncate(jd_text, _JD_BUDGET)}
 
-                # Skip empty lines
-                if not line:
-                    continue
+CANDIDATE RESUME:
+{_budget_truncate(resume_text, _RESUME_BUDGET)}
+
+ANALYSIS:
+1. A match score from 1-10 (10 being perfect match)
+2. Key skills that match between JD and resume
+3. Any gaps or areas of concern
+4. Overall assessment
+
+QUESTIONS:
+- Reference specific skills, tools, projects or experiences from the resume/JD
+- Cover gaps between JD requirements and resume experience (if any)
+- Balance technical and behavioral questions; keep them conversational
+- Avoid generic questions; ALL QUESTIONS MUST BE IN ENGLISH ONLY
 
-                # Handle various numbering formats
-                question = None
-
-                # Check for numbered lists (1., 2., etc.)
-                if line[0].isdigit() and len(line) > 2:
-                    parts = line.split('.', 1)
-                    if len(parts) > 1:
-                        question = parts[1].strip()
-                    else:
-                        question = line
-
-                # Check for bullet points
-                elif line.startswith(('- ', '• ', '* ')):
-                    question = line[2:].strip() if len(line) > 2 else line[1:].strip()
-
-                # Check for other common formats
-                elif line.startswith(('Q:', 'Question:')):
-                    question = line.split(':', 1)[1].strip() if ':' in line else line
-
-                # If no specific format detected, treat as question if it's long enough
-                elif len(line) > 15 and '?' in line:
-                    question = line
-
-                # Clean up the question
-                if question:
-                    question = question.strip(' -"')
-                    # Remove any remaining numbering or bullets
-                    question = question.lstrip('0123456789.-•* ')
-                    question = question.strip()
-
-                    # Filter out very short questions and non-questions
-                    if (question and len(question) > 10 and
-                        '?' in question and
-                        not question.lower().startswith(('here', 'below', 'above', 'note'))):
-                        questions.append(question)
-
-            # Log parsing results
-            logger.info(f"Successfully parsed {len(questions)} questions from LLM response")
-
-            # Ensure we have the requested number of questions - if not enough, raise error
+Return ONLY a JSON object with keys: match_score (number), key_skills (array of strings), gaps (array of strings), assessment (string), questions (array of exactly {num_questions} question strings)
+"""
+
+        try:
+            response_format = {"type": "json_object"}
+            response_text = await self._complete(prompt, skip_cache=skip_cache, system_prompt=_INTERVIEW_SYSTEM_PROMPT,
+                                                 response_format=response_format)
+
+            parsed = orjson.loads(response_text)
+            questions = [
+                q.strip() for q in parsed.get("questions", [])
+                if isinstance(q, str) and len(q.strip()) > 10
+            ]
             if len(questions) < num_questions:
-                logger.error(f"LLM generated only {len(questions)} questions, but {num_questions} were requested. Cannot proceed without sufficient AI-generated questions.")
-                raise RuntimeError(f"LLM could not generate enough questions ({len(questions)}/{num_questions}). Please check your OpenAI API key and try again.")
+                raise ValueError(f"only {len(questions)}/{num_questions} questions returned")
 
-            # Format questions with proper structure
-            return [{"id": i+1, "question": question} for i, question in enumerate(questions[:num_questions])]
+            return {
+                "analysis": {
+                    "match_score": parsed.get("match_score", 7),
+                    "key_skills": parsed.get("key_skills", []),
+                    "gaps": parsed.get("gaps", []),
+                    "assessment": parsed.get("assessment", "")
+                },
+                "questions": [{"id": i+1, "question": question} for i, question in enumerate(questions[:num_questions])]
+            }
 
         except Exception as e:
-            logger.error(f"Error generating questions with LLM: {e}")
-            return self._generate_fallback_questions(num_questions)
+            _evict_completion(prompt, system_prompt=_INTERVIEW_SYSTEM_PROMPT, response_format={"type": "json_object"})
+            logger.warning(f"Combined analysis and question generation failed ({e}), falling back to separate calls")
+            analysis, questions = await asyncio.gather(
+                self.analyze_documents(jd_text, resume_text, skip_cache=skip_cache),
+                self.generate_interview_questions(jd_text, resume_text, num_questions, skip_cache=skip_cache)
+            )
+            return {"analysis": analysis, "questions": questions}
 
     def _generate_fallback_questions(self, num_questions: int) -> List[Dict[str, Any]]:
         """Generate generic fallback questions when LLM is not available"""
-        fallback_questions = [
-            "Can you walk me through your professional background and key experiences?",
-            "What motivated you to apply for this position?",
-            "Can you describe a challenging project you've worked on and how you handled it?",
-            "How do you approach problem-solving in your work?",
-            "What are your greatest professional strengths?",
-            "Can you tell me about a time when you had to learn something new quickly?",
-            "How do you handle working under pressure or meeting tight deadlines?",
-            "Describe your experience working in a team environment.",
-            "What tools and technologies are you most proficient with?",
-            "How do you stay current with industry trends and best practices?",
-            "Can you discuss a situation where you received constructive feedback and how you responded?",
-            "What are your career goals and how does this position align with them?",
-            "How do you prioritize tasks when working on multiple projects?",
-            "Can you describe your experience with project management or coordination?",
-            "What do you consider to be your most significant professional achievement?",
-            "How do you handle conflicts or disagreements in a professional setting?",
-            "What experience do you have with quality assurance or testing processes?",
-            "How do you approach documentation and knowledge sharing?",
-            "Can you discuss your experience with stakeholder communication?",
-            "What strategies do you use for continuous professional development?"
-        ]
-
-        selected_questions = fallback_questions[:num_questions]
-        return [{"id": i+1, "question": question} for i, question in enumerate(selected_questions)]
+        # Copies, since callers store and may modify the returned dicts
+        return [dict(question) for question in _FALLBACK_QUESTION_DICTS[:num_questions]]
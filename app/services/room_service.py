@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Dict, Optional, Tuple
 from app.services.livekit_service import LiveKitService
@@ -37,8 +38,7 @@ class RoomService:
                 }
 
             # Generate tokens
-            candidate_token = self.livekit_service.generate_token(room_name, candidate_name)
-            agent_token = self.livekit_service.generate_token(room_name, 'interview_agent', is_agent=True)
+            candidate_token, agent_token = await self.generate_tokens_for_room(room_name, candidate_name)
 
             if not candidate_token or not agent_token:
                 logger.error(f"Failed to generate tokens for room {room_name}")
@@ -105,10 +105,12 @@ class RoomService:
             logger.error(f"Error getting participants for room {room_name}: {e}")
             return None
 
-    def generate_tokens_for_room(self, room_name: str, candidate_name: str) -> Tuple[str, str]:
+    async def generate_tokens_for_room(self, room_name: str, candidate_name: str) -> Tuple[str, str]:
         """
         Generate both candidate and agent tokens for a room.
 
+        The JWTs are signed concurrently on worker threads so signing doesn't block the event loop.
+
         Args:
             room_name: Name of the room
             candidate_name: Name of the candidate
@@ -116,6 +118,8 @@ class RoomService:
         Returns:
             Tuple of (candidate_token, agent_token)
         """
-        candidate_token = self.livekit_service.generate_token(room_name, candidate_name)
-        agent_token = self.livekit_service.generate_token(room_name, 'interview_agent', is_agent=True)
+        candidate_token, agent_token = await asyncio.gather(
+            asyncio.to_thread(self.livekit_service.generate_token, room_name, candidate_name),
+            asyncio.to_thread(self.livekit_service.generate_token, room_name, 'interview_agent', True)
+        )
         return candidate_token, agent_token
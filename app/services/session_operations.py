@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import uuid
 from typing import Dict, List, Optional, Any
 from app.services.session_service import InterviewSessionService
 from app.services.room_service import RoomService
@@ -38,11 +40,26 @@ class SessionOperations:
                 "transcript": []
             }
 
-            # Create session
-            session_id = await self.session_service.create_session(base_data)
-
-            # Create room and get tokens
-            room_result = await self.room_service.create_interview_room(session_id, session_data['candidate_name'])
+            # The room name only needs the session ID, so generate it up front and
+            # persist the session while the room is created on LiveKit
+            session_id = str(uuid.uuid4())
+            session_res, room_result = await asyncio.gather(
+                self.session_service.create_session(base_data, session_id=session_id),
+                self.room_service.create_interview_room(session_id, session_data['candidate_name']),
+                return_exceptions=True
+            )
+            if isinstance(room_result, Exception):
+                room_result = {"success": False, "error": str(room_result)}
+
+            if isinstance(session_res, Exception):
+                logger.error(f"Failed to create session {session_id}: {session_res}")
+                # Clean up the room if it was created
+                if room_result.get("success"):
+                    await self.room_service.delete_room(room_result["room_name"])
+                return {
+                    "success": False,
+                    "error": f"Session creation failed: {session_res}"
+                }
 
             if not room_result.get("success"):
                 logger.error(f"Failed to create room for session {session_id}: {room_result.get('error')}")
@@ -65,9 +82,15 @@ class SessionOperations:
             success = await self.session_service.update_session(session_id, updates)
             if not success:
                 logger.error(f"Failed to update session {session_id} with room details")
-                # Clean up room and session
-                await self.room_service.delete_room(room_result["room_name"])
-                await self.session_service.delete_session(session_id)
+                # Clean up room and session; the two deletions are independent
+                room_res, session_res = await asyncio.gather(
+                    self.room_service.delete_room(room_result["room_name"]),
+                    self.session_service.delete_session(session_id),
+                    return_exceptions=True
+                )
+                for label, result in (("room", room_res), ("session", session_res)):
+                    if isinstance(result, Exception):
+                        logger.error(f"Rollback failed to delete {label} for session {session_id}: {result}")
                 return {
                     "success": False,
                     "error": "Session update failed"
@@ -142,13 +165,22 @@ class SessionOperations:
                 "room_deleted": False
             }
 
-            # Delete room if it exists
+            # Delete room (if it exists) and session concurrently
             if room_name:
-                room_result = await self.room_service.delete_room(room_name)
-                cleanup_results["room_deleted"] = room_result.get("success", False)
-
-            # Delete session
-            session_deleted = await self.session_service.delete_session(session_id)
+                room_result, session_deleted = await asyncio.gather(
+                    self.room_service.delete_room(room_name),
+                    self.session_service.delete_session(session_id),
+                    return_exceptions=True
+                )
+                if isinstance(room_result, Exception):
+                    logger.error(f"Error deleting room {room_name} for session {session_id}: {room_result}")
+                else:
+                    cleanup_results["room_deleted"] = room_result.get("success", False)
+                if isinstance(session_deleted, Exception):
+                    logger.error(f"Error deleting session {session_id}: {session_deleted}")
+                    session_deleted = False
+            else:
+                session_deleted = await self.session_service.delete_session(session_id)
             cleanup_results["session_deleted"] = session_deleted
 
             success = cleanup_results["session_deleted"]
@@ -177,16 +209,23 @@ class SessionOperations:
         try:
             sessions = await self.session_service.list_sessions()
 
-            # Enhance with room status where possible
+            # Enhance with room status where possible; look up all rooms concurrently
             for session in sessions:
-                room_name = session.get('room_name')
-                if room_name:
-                    participants = await self.room_service.get_room_participants(room_name)
-                    session['active_participants'] = len(participants) if participants else 0
-                    session['is_room_active'] = len(participants) > 0 if participants else False
-                else:
-                    session['active_participants'] = 0
-                    session['is_room_active'] = False
+                session['active_participants'] = 0
+                session['is_room_active'] = False
+
+            with_rooms = [session for session in sessions if session.get('room_name')]
+            results = await asyncio.gather(
+                *(self.room_service.get_room_participants(session['room_name']) for session in with_rooms),
+                return_exceptions=True
+            )
+            for session, participants in zip(with_rooms, results):
+                if isinstance(participants, Exception):
+                    logger.warning(f"Failed to get participants for room {session['room_name']}: {participants}")
+                    continue
+                if participants:
+                    session['active_participants'] = len(participants)
+                    session['is_room_active'] = True
 
             return sessions
 
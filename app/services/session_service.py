@@ -3,24 +3,34 @@ import os
 import logging
 import aiofiles
 import asyncio
+import threading
+import orjson
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from asyncio import Lock
 
-class CustomJSONEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle non-serializable objects by converting them to strings"""
-    def default(self, obj):
-        try:
-            return super().default(obj)
-        except TypeError:
-            return str(obj)
+def _dump_session(session_data: Dict[str, Any]) -> bytes:
+    """Serialize session data, converting non-serializable objects to strings."""
+    return orjson.dumps(session_data, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
 
 logger = logging.getLogger(__name__)
 
+# Append-only room_name -> session_id log kept beside the session files; the
+# extension keeps it out of the *.json session scans
+_ROOM_INDEX_FILE = "_room_index.jsonl"
+# On an index miss only the most recently modified session files are checked
+_ROOM_FALLBACK_SCAN = 5
+
 class InterviewSessionService:
     def __init__(self, sessions_dir: str = "interview_sessions"):
         self.sessions_dir = sessions_dir
+        self.room_index_file = os.path.join(sessions_dir, _ROOM_INDEX_FILE)
         self.sessions_lock = asyncio.Lock()
+        # In-memory copy of the room index; lookups read only what other processes
+        # appended past _room_index_offset
+        self._room_index: Dict[str, str] = {}
+        self._room_index_offset = 0
+        self._room_index_lock = threading.Lock()
         self._ensure_sessions_dir()
 
     def _ensure_sessions_dir(self):
@@ -28,10 +38,11 @@ class InterviewSessionService:
         if not os.path.exists(self.sessions_dir):
             os.makedirs(self.sessions_dir)
 
-    async def create_session(self, session_data: Dict[str, Any]) -> str:
-        """Create a new interview session."""
-        import uuid
-        session_id = str(uuid.uuid4())
+    async def create_session(self, session_data: Dict[str, Any], session_id: Optional[str] = None) -> str:
+        """Create a new interview session, optionally under a pre-generated ID."""
+        if session_id is None:
+            import uuid
+            session_id = str(uuid.uuid4())
 
         session_data.update({
             'session_id': session_id,
@@ -41,8 +52,8 @@ class InterviewSessionService:
 
         async with self.sessions_lock:
             session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
-            async with aiofiles.open(session_file, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(session_data, indent=2, cls=CustomJSONEncoder))
+            async with aiofiles.open(session_file, 'wb') as f:
+                await f.write(_dump_session(session_data))
 
         logger.info(f"Created session {session_id}")
         return session_id
@@ -73,13 +84,82 @@ class InterviewSessionService:
         async with self.sessions_lock:
             session_file = os.path.join(self.sessions_dir, f"{session_id}.json")
             try:
-                async with aiofiles.open(session_file, 'w', encoding='utf-8') as f:
-                    await f.write(json.dumps(session_data, indent=2, cls=CustomJSONEncoder))
-                return True
+                async with aiofiles.open(session_file, 'wb') as f:
+                    await f.write(_dump_session(session_data))
             except Exception as e:
                 logger.error(f"Error updating session {session_id}: {e}")
                 return False
 
+        if updates.get('room_name'):
+            await self._index_room(updates['room_name'], session_id)
+        return True
+
+    async def _index_room(self, room_name: str, session_id: str):
+        """Record a room's session in the room index; later entries win."""
+        entry = json.dumps({"room_name": room_name, "session_id": session_id}) + "\n"
+        try:
+            async with aiofiles.open(self.room_index_file, 'a', encoding='utf-8') as f:
+                await f.write(entry)
+        except Exception as e:
+            # Lookups fall back to scanning the session files
+            logger.warning(f"Error indexing room {room_name}: {e}")
+
+    def _refresh_room_index(self) -> Dict[str, str]:
+        """Apply room index lines appended since the last refresh (blocking)."""
+        with self._room_index_lock:
+            try:
+                with open(self.room_index_file, 'rb') as f:
+                    if os.fstat(f.fileno()).st_size < self._room_index_offset:
+                        # Index was truncated or replaced; start over
+                        self._room_index.clear()
+                        self._room_index_offset = 0
+                    f.seek(self._room_index_offset)
+                    data = f.read()
+            except FileNotFoundError:
+                return self._room_index
+            except Exception as e:
+                logger.warning(f"Error reading room index: {e}")
+                return self._room_index
+
+            # Leave a partly written last line for the next refresh
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # Torn write from a crash
+                if entry.get('room_name') and entry.get('session_id'):
+                    self._room_index[entry['room_name']] = entry['session_id']
+            self._room_index_offset += end
+            return self._room_index
+
+    def _newest_session_ids(self, limit: int) -> List[str]:
+        """Return the IDs of the most recently modified session files (blocking)."""
+        try:
+            with os.scandir(self.sessions_dir) as it:
+                entries = [(entry.stat().st_mtime, entry.name[:-5]) for entry in it
+                           if entry.name.endswith('.json') and entry.is_file()]
+        except FileNotFoundError:
+            return []
+        entries.sort(reverse=True)
+        return [session_id for _, session_id in entries[:limit]]
+
+    async def get_session_by_room(self, room_name: str) -> Optional[Dict[str, Any]]:
+        """Get session data by room name via the room index, checking the newest sessions on a miss."""
+        room_index = await asyncio.to_thread(self._refresh_room_index)
+        session_id = room_index.get(room_name)
+        if session_id:
+            session_data = await self.get_session(session_id)
+            if session_data and session_data.get('room_name') == room_name:
+                return session_data
+
+        # Sessions written before the index existed, or whose index append failed
+        for session_id in await asyncio.to_thread(self._newest_session_ids, _ROOM_FALLBACK_SCAN):
+            session_data = await self.get_session(session_id)
+            if session_data and session_data.get('room_name') == room_name:
+                return session_data
+        return None
+
     async def list_sessions(self) -> List[Dict[str, Any]]:
         """List all sessions."""
         sessions = []
@@ -1,5 +1,7 @@
 import asyncio
+import concurrent.futures
 import logging
+import threading
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator, Optional
 from livekit import api
@@ -25,10 +27,15 @@ class AsyncLiveKitManager:
         try:
             for attempt in range(self.max_retries):
                 try:
+                    # Reuse the app's pooled aiohttp session (and its warm connections) when
+                    # running on the loop it was started on (the worker loop behind
+                    # submit_async); LiveKitAPI leaves a caller-supplied session open and
+                    # creates its own for None
                     lk_api = api.LiveKitAPI(
                         url=self.url,
                         api_key=self.api_key,
-                        api_secret=self.api_secret
+                        api_secret=self.api_secret,
+                        session=get_http_client().session_for_running_loop()
                     )
 
                     # Test the connection with a simple call
@@ -400,6 +407,33 @@ async def run_async_with_cleanup(coro, timeout: Optional[float] = None):
         logger.error(f"Async execution failed: {e}")
         raise
 
+# Long-lived event loop on a daemon thread, shared by sync request handlers
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_loop_lock = threading.Lock()
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the shared background event loop."""
+    global _worker_loop
+    with _worker_loop_lock:
+        if _worker_loop is None or _worker_loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="async-worker", daemon=True).start()
+            _worker_loop = loop
+    return _worker_loop
+
+def submit_async(coro, timeout: Optional[float] = None):
+    """Run async coroutine on the shared background loop and wait for its result."""
+    future = asyncio.run_coroutine_threadsafe(coro, get_worker_loop())
+    try:
+        return future.result(timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        logger.error(f"Async operation timed out after {timeout} seconds")
+        raise
+    except Exception as e:
+        logger.error(f"Async execution on worker loop failed: {e}")
+        raise
+
 def run_async_in_new_loop(coro, timeout: Optional[float] = None):
     """Run async coroutine in a new event loop to avoid conflicts."""
     try:
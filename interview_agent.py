@@ -1,21 +1,28 @@
+import aiofiles
 import asyncio
+import hashlib
+import importlib
 import logging
 import os
-import json
+import re
+import time
+import uuid
+import orjson
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Annotated
 from pathlib import Path
+from types import MappingProxyType, SimpleNamespace
 from datetime import datetime
 from livekit import agents, rtc
-from livekit.agents import JobContext, WorkerOptions, cli, tokenize, tts, ChatContext, ChatMessage
+from livekit.agents import JobContext, JobProcess, WorkerOptions, cli, tokenize, tts, ChatContext, ChatMessage
 from livekit.agents import Agent, AgentSession, RoomInputOptions
-from livekit.plugins import openai, deepgram, silero, elevenlabs, anam
 
 from dotenv import load_dotenv
-import PyPDF2
-import io
 import webrtcvad
 
-from app.services.session_service import CustomJSONEncoder
+from app.services.session_service import InterviewSessionService
+from app.services.document_service import DocumentProcessingService
 
 
 
@@ -23,43 +30,22 @@ from app.services.session_service import CustomJSONEncoder
 dotenv_path = Path(__file__).parent / 'keys.env'
 load_dotenv(dotenv_path=dotenv_path)
 
-logger = logging.getLogger("interview-agent")
-
-class MockLLM:
-    """Fallback LLM when OpenAI is unavailable"""
-    def chat(self, chat_ctx):
-        class MockStream:
-            async def __aenter__(self):
-                return self
-            async def __aexit__(self, exc_type, exc_val, exc_tb):
-                pass
-            def __aiter__(self):
-                return self
-            async def __anext__(self):
-                class MockChunk:
-                    def __init__(self, text):
-                        self.delta = MockDelta(text)
-                class MockDelta:
-                    def __init__(self, text):
-                        self.content = text
-                # Yield one chunk and then stop
-                if not hasattr(self, '_yielded'):
-                    self._yielded = True
-                    return MockChunk("I'm sorry, AI services are currently unavailable. Please try again later or contact support for assistance.")
-                else:
-                    raise StopAsyncIteration
-
-        return MockStream()
+# API keys resolved once at import instead of on every job/session setup
+ENV = MappingProxyType({
+    name: os.getenv(name)
+    for name in (
+        'OPENAI_API_KEY',
+        'DEEPGRAM_API_KEY',
+        'ELEVENLABS_API_KEY',
+        'ANAM_API_KEY',
+    )
+})
 
-# Global storage for parsed documents
-job_description = ""
-resume_content = ""
-questions_generated = []
+logger = logging.getLogger("interview-agent")
 
-class InterviewAssistant(Agent):
-    def __init__(self, session_file=None, session_data=None):
-        super().__init__(
-            instructions="""You are an expert HR interviewer. I will provide a job description and resume. Your tasks:
+# Agent and question-generation instructions are kept byte-identical across sessions
+# so OpenAI's automatic prompt caching can reuse them as a shared prefix
+_INTERVIEWER_INSTRUCTIONS = """You are an expert HR interviewer. I will provide a job description and resume. Your tasks:
 
 1. ANALYZE: Review both documents to identify key requirements, candidate strengths, and gaps.
 
@@ -89,6 +75,178 @@ The interview should be structured and efficient,quite conversational.
 
 You have access to function tools for document processing, question generation, and interview management.
 Use these tools appropriately to maintain the structured interview flow."""
+
+_QUESTION_PROMPT_PREFIX = """You are an expert HR interviewer. Analyze the Job Description and Resume provided by the user to generate 5 thoughtful, comprehensive interview questions.
+
+Generate questions that demonstrate your expertise as an HR interviewer by:
+1. Assessing technical competencies and hands-on experience mentioned in the resume
+2. Exploring how the candidate's background aligns with the job requirements
+3. Evaluating problem-solving approaches and critical thinking skills
+4. Understanding the candidate's career progression and professional development
+5. Gauging cultural fit and communication abilities
+
+Focus on questions that reveal the candidate's depth of experience, ability to handle challenges, and potential for growth in this role. Make questions conversational and insightful, allowing the candidate to provide detailed responses that showcase their capabilities."""
+
+# Provider plugins are imported on first use: silero pulls in onnxruntime and numpy,
+# anam its WebRTC stack, and the supervisor process never needs any of them.
+# livekit registers a plugin when it is imported and requires the main thread for
+# that, so prewarm imports the configured providers before any job runs
+_PLUGIN_KEYS = MappingProxyType({
+    'silero': None,
+    'openai': 'OPENAI_API_KEY',
+    'deepgram': 'DEEPGRAM_API_KEY',
+    'elevenlabs': 'ELEVENLABS_API_KEY',
+    'anam': 'ANAM_API_KEY',
+})
+
+def _plugin(name: str):
+    """Return the livekit.plugins module for a provider, importing it on first use."""
+    return importlib.import_module(f"livekit.plugins.{name}")
+
+# One OpenAI LLM per agent process, shared by question generation and every session's
+# turns so they reuse the same kept-alive HTTP connections
+_llm = None
+
+def _get_llm(api_key: str):
+    global _llm
+    if _llm is None:
+        _llm = _plugin("openai").LLM(model="gpt-4o-mini", api_key=api_key)
+    return _llm
+
+# Transcript entries arriving within this window are written to the session file together
+_TRANSCRIPT_FLUSH_INTERVAL = 2.0  # seconds
+# Session file writes are serialized per assistant, so only these are worth retrying;
+# PermissionError covers os.replace racing a reader on Windows
+_SESSION_WRITE_RETRYABLE = (BlockingIOError, InterruptedError, PermissionError)
+_SESSION_WRITE_ATTEMPTS = 3
+
+# Configured once; set_mode is the only state, so sessions can share it
+_WEBRTC_VAD = webrtcvad.Vad(3)  # Most aggressive filtering for clean speech
+
+# STT calls that exhaust their retries this many times in a row stop hitting the
+# provider for the cooldown, so an outage doesn't cost every utterance the full backoff
+_STT_BREAKER_THRESHOLD = 5
+_STT_BREAKER_COOLDOWN = 30.0  # seconds
+
+# A numbered question line ("1." / "1)"); group 1 is the question text
+_Q_RE = re.compile(r'^\s*\d+[.)]\s*(.+?)\s*$', re.MULTILINE)
+
+# Common false positives from STT, checked per transcribed word, so only single
+# words can ever match
+_STT_NOISE_WORDS = frozenset([
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'um', 'uh', 'er', 'ah', 'like', 'so', 'well', 'okay',
+    'yeah', 'yes', 'no', 'hi', 'hello', 'hey', 'bye', 'goodbye', 'please', 'sorry'
+])
+_STT_FUNCTION_WORDS = frozenset(['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'])
+
+def _word_run_re(words, max_words=None) -> re.Pattern:
+    """Compile a full-match pattern for whitespace-separated runs of the given words."""
+    alt = '|'.join(map(re.escape, sorted(words)))
+    repeat = '*' if max_words is None else f'{{0,{max_words - 1}}}'
+    return re.compile(rf'(?:{alt})(?:\s+(?:{alt})){repeat}')
+
+# One match over the whole utterance instead of split() plus a per-word lookup
+_STT_NOISE_RE = _word_run_re(_STT_NOISE_WORDS, max_words=3)
+_STT_FUNCTION_RE = _word_run_re(_STT_FUNCTION_WORDS)
+# Longest single-spaced utterance _STT_NOISE_RE can match (three of the longest noise
+# word); anything longer is speech without running either pattern
+_STT_NOISE_MAX_LEN = 3 * max(map(len, _STT_NOISE_WORDS)) + 2
+
+@lru_cache(maxsize=2048)
+def _is_stt_noise(text_lower: str) -> bool:
+    """Whether a stripped, lowercased utterance is filler rather than speech.
+
+    STT keeps producing the same short fragments ("um", "the", "okay"), so results
+    are cached per distinct utterance.
+    """
+    n = len(text_lower)
+    if n < 2:
+        return True
+    if n > _STT_NOISE_MAX_LEN:
+        return False
+
+    # If text is only noise words, likely not actual speech
+    if _STT_NOISE_RE.fullmatch(text_lower):
+        return True
+
+    # If text is very short and contains only articles/prepositions, likely noise
+    return n <= 10 and _STT_FUNCTION_RE.fullmatch(text_lower) is not None
+
+# Generated questions keyed by a hash of the JD/resume pair, so sessions over the
+# same documents skip the LLM call
+_QUESTION_CACHE_DIR = Path(__file__).parent / 'question_cache'
+
+def _question_cache_key(jd: str, resume: str) -> str:
+    return hashlib.sha256((jd.strip() + "\x00" + resume.strip()).encode('utf-8')).hexdigest()
+
+def _numbered_list(items) -> str:
+    """Format items as "1. item" lines."""
+    return "\n".join(f"{i}. {item}" for i, item in enumerate(items, 1))
+
+async def _collect_completion(llm, chat_ctx) -> str:
+    """Stream a chat completion and return its full text."""
+    # Collect deltas and join once instead of growing a str per chunk
+    parts = []
+    async with llm.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            content = getattr(chunk.delta, 'content', None)
+            if content:
+                parts.append(content)
+    return "".join(parts)
+
+# get_transcript display formatting: (icon, name) per speaker, with any non-agent
+# speaker shown as the candidate, and per-type text formatters
+_SPEAKER_META = MappingProxyType({'agent': ("🤖", "Interviewer")})
+_DEFAULT_SPEAKER = ("👤", "Candidate")
+_TYPE_FORMATTERS = MappingProxyType({
+    'greeting': lambda text, entry: f"*{text}*",
+    'question': lambda text, entry: f"**Question {entry.get('question_number', '')}:** {text}",
+})
+
+class _EmptySTTResult:
+    """Recognition result returned when a transcription is dropped or fails"""
+    __slots__ = ()
+    text = ''
+    alternatives = ()
+
+_EMPTY_STT_RESULT = _EmptySTTResult()
+
+_MOCK_LLM_REPLY = "I'm sorry, AI services are currently unavailable. Please try again later or contact support for assistance."
+
+class MockLLM:
+    """Fallback LLM when OpenAI is unavailable"""
+    @asynccontextmanager
+    async def chat(self, chat_ctx):
+        async def stream():
+            yield SimpleNamespace(delta=SimpleNamespace(content=_MOCK_LLM_REPLY))
+        yield stream()
+
+# Global storage for parsed documents
+job_description = ""
+resume_content = ""
+questions_generated = []
+
+def _update_session_file(path: str, updates: dict):
+    """Merge fields into a session file and atomically replace it (blocking)."""
+    with open(path, 'rb') as f:
+        session_data = orjson.loads(f.read())
+    session_data.update(updates)
+
+    # Writers hold the assistant's session write lock, so one temp name per session
+    # file is enough. Compact orjson output, with str() for unknown types
+    temp_file = f"{path}.tmp"
+    with open(temp_file, 'wb') as f:
+        f.write(orjson.dumps(session_data, default=str))
+    os.replace(temp_file, path)
+
+
+class InterviewAssistant(Agent):
+    def __init__(self, session_file=None, session_data=None):
+        super().__init__(
+            instructions=_INTERVIEWER_INSTRUCTIONS
         )
         self.session_file = session_file
         self.session_id = session_data.get('session_id') if session_data else None
@@ -97,88 +255,138 @@ Use these tools appropriately to maintain the structured interview flow."""
         self.questions = []
         self.current_question_index = 0
         self.transcript = []  # Initialize transcript list for conversation capture
+        self._transcript_dirty = asyncio.Event()
+        self._flush_task = None
+        self._snapshot_count = 0  # entries in the last session file write
+        self._session_write_lock = asyncio.Lock()
+        self._transcript_text = ""  # "Speaker: text" lines for LLM prompts
+        self._transcript_text_count = 0  # entries already formatted into _transcript_text
+
+    def transcript_text(self) -> str:
+        """Return the transcript as "Speaker: text" lines, formatting only entries added since the last call"""
+        if self._transcript_text_count < len(self.transcript):
+            new_entries = self.transcript[self._transcript_text_count:]
+            self._transcript_text += "".join(
+                f"{'Interviewer' if entry.get('speaker', 'unknown') == 'agent' else 'Candidate'}: {entry.get('text', '')}\n"
+                for entry in new_entries
+            )
+            self._transcript_text_count += len(new_entries)
+        return self._transcript_text
 
-    async def save_transcript_to_session(self):
-        """Save the current transcript to the session file with retry logic"""
-        if not self.session_file:
-            return
-
-        session_file_path = str(self.session_file)
-        if not os.path.exists(session_file_path):
-            return
+    def mark_transcript_dirty(self):
+        """Schedule a coalesced transcript save instead of rewriting the session file per utterance"""
+        self._transcript_dirty.set()
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
 
-        max_retries = 3
-        for attempt in range(max_retries):
+    async def _flush_loop(self):
+        while True:
+            await self._transcript_dirty.wait()
+            await asyncio.sleep(_TRANSCRIPT_FLUSH_INTERVAL)
+            self._transcript_dirty.clear()
+            await self.save_transcript_to_session()
+
+    async def flush_transcript(self, **session_updates) -> bool:
+        """Stop the background saver and write any pending transcript entries now,
+        along with any extra session fields; returns False if the session file write failed"""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
             try:
-                # Use async file operations
-                import aiofiles
-                async with aiofiles.open(session_file_path, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    session_data = json.loads(content)
-
-                # Update transcript in session data
-                session_data['transcript'] = self.transcript
-                session_data['updated_at'] = datetime.now().isoformat()
-
-                # Atomic write with unique temp file to avoid conflicts
-                import uuid
-                temp_file = f"{session_file_path}.{uuid.uuid4().hex}.tmp"
-                async with aiofiles.open(temp_file, 'w', encoding='utf-8') as f:
-                    await f.write(json.dumps(session_data, indent=2, cls=CustomJSONEncoder))
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+        self._transcript_dirty.clear()
+        if session_updates or self._snapshot_count < len(self.transcript):
+            return await self.save_transcript_to_session(**session_updates)
+        return True
 
-                # Use os.replace for atomic operation
-                os.replace(temp_file, session_file_path)
+    async def save_transcript_to_session(self, **session_updates) -> bool:
+        """Save the current transcript, plus any extra session fields, to the session file with retry logic"""
+        if not self.session_file:
+            return False
 
-                logger.info(f"💾 Saved {len(self.transcript)} transcript entries to session file")
-                return  # Success, exit retry loop
+        session_file_path = str(self.session_file)
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Failed to save transcript (attempt {attempt + 1}/{max_retries}): {e}, retrying...")
-                    await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
-                else:
-                    logger.error(f"Failed to save transcript after {max_retries} attempts: {e}")
+        async with self._session_write_lock:
+            for attempt in range(_SESSION_WRITE_ATTEMPTS):
+                try:
+                    # Update transcript in session data
+                    snapshot_count = len(self.transcript)
+                    updates = {
+                        'transcript': self.transcript[:snapshot_count],
+                        'updated_at': datetime.now().isoformat(),
+                        **session_updates
+                    }
+
+                    # The whole read-modify-write is one thread hop rather than one per
+                    # file operation. It runs to completion even if this coroutine is
+                    # cancelled (flush_transcript cancels the background saver), so the
+                    # lock is never released while a thread still owns the temp file
+                    write = asyncio.ensure_future(
+                        asyncio.to_thread(_update_session_file, session_file_path, updates))
+                    try:
+                        await asyncio.shield(write)
+                    except asyncio.CancelledError:
+                        await write
+                        raise
+
+                    self._snapshot_count = snapshot_count
+
+                    logger.info(f"💾 Saved {len(self.transcript)} transcript entries to session file")
+                    return True  # Success, exit retry loop
+
+                except FileNotFoundError:
+                    # Checked by opening rather than a separate exists() stat
+                    logger.warning(f"Session file not found: {session_file_path}")
+                    break
+                except _SESSION_WRITE_RETRYABLE as e:
+                    if attempt < _SESSION_WRITE_ATTEMPTS - 1:
+                        logger.warning(f"Failed to save transcript (attempt {attempt + 1}/{_SESSION_WRITE_ATTEMPTS}): {e}, retrying...")
+                        await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
+                    else:
+                        logger.error(f"Failed to save transcript after {_SESSION_WRITE_ATTEMPTS} attempts: {e}")
+                except Exception as e:
+                    logger.error(f"Failed to save transcript: {e}")
+                    break
+        return False
 
 
 
     async def parse_pdf(self, file_data: bytes) -> str:
-        """Parse PDF content from bytes"""
+        """Parse PDF content from bytes in the document service's worker processes"""
         try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_data))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text()
-            return text.strip()
+            text = await DocumentProcessingService().extract_text_from_file_async(file_data, "document.pdf")
+            if text.startswith("PDF text extraction failed"):
+                logger.error(f"Error parsing PDF: {text}")
+                return ""
+            return text
         except Exception as e:
             logger.error(f"Error parsing PDF: {e}")
             return ""
     
     async def generate_questions(self, jd: str, resume: str) -> list[str]:
         """Generate interview questions based on JD and resume"""
-        prompt = f"""As an expert HR interviewer, analyze the following Job Description and Resume to generate 5 thoughtful, comprehensive interview questions.
-
-Job Description:
+        # Static instructions go first (as the system message) so every request shares
+        # a cacheable prefix; only the documents vary
+        prompt = f"""Job Description:
 {jd}
 
 Resume:
 {resume}
 
-Generate questions that demonstrate your expertise as an HR interviewer by:
-1. Assessing technical competencies and hands-on experience mentioned in the resume
-2. Exploring how the candidate's background aligns with the job requirements
-3. Evaluating problem-solving approaches and critical thinking skills
-4. Understanding the candidate's career progression and professional development
-5. Gauging cultural fit and communication abilities
-
-Focus on questions that reveal the candidate's depth of experience, ability to handle challenges, and potential for growth in this role. Make questions conversational and insightful, allowing the candidate to provide detailed responses that showcase their capabilities.
-
 Return only the questions, numbered 1-5."""
 
+        cache_file = _QUESTION_CACHE_DIR / f"{_question_cache_key(jd, resume)}.json"
+        cached = await self._load_cached_questions(cache_file)
+        if cached:
+            logger.info(f"Using {len(cached)} cached interview questions")
+            return cached
+
         # Use OpenAI to generate questions with fallback
-        openai_key = os.getenv("OPENAI_API_KEY")
+        openai_key = ENV["OPENAI_API_KEY"]
         if openai_key:
             try:
-                llm = openai.LLM(model="gpt-4o-mini", api_key=openai_key)
+                llm = _get_llm(openai_key)
                 logger.info("OpenAI LLM (gpt-4o-mini) initialized for question generation")
             except Exception as e:
                 logger.error(f"OpenAI LLM initialization failed: {e}")
@@ -189,15 +397,7 @@ Return only the questions, numbered 1-5."""
             return self._generate_fallback_questions(5)
         
         try:
-            chat_ctx = ChatContext()
-            chat_ctx.add_message(role="system", content="You are an expert HR interviewer. Generate insightful, relevant interview questions.")
-            chat_ctx.add_message(role="user", content=prompt)
-
-            questions_text = ""
-            async with llm.chat(chat_ctx=chat_ctx) as stream:
-                async for chunk in stream:
-                    if chunk.delta and hasattr(chunk.delta, 'content'):
-                        questions_text += chunk.delta.content or ""
+            questions_text = await self._complete_questions(llm, prompt)
         except (asyncio.TimeoutError, asyncio.CancelledError, Exception) as e:
             error_msg = str(e).lower()
             if any(keyword in error_msg for keyword in ["event loop is closed", "cancelled", "connection", "timeout"]):
@@ -206,17 +406,10 @@ Return only the questions, numbered 1-5."""
                 await asyncio.sleep(1.0)
                 try:
                     # Retry the LLM call
-                    chat_ctx = ChatContext()
-                    chat_ctx.add_message(role="system", content="You are an expert HR interviewer. Generate insightful, relevant interview questions.")
-                    chat_ctx.add_message(role="user", content=prompt)
-
-                    questions_text = ""
-                    async with llm.chat(chat_ctx=chat_ctx) as stream:
-                        async for chunk in stream:
-                            if chunk.delta and hasattr(chunk.delta, 'content'):
-                                questions_text += chunk.delta.content or ""
+                    questions_text = await self._complete_questions(llm, prompt)
                     # Parse questions into list
-                    questions = [q.strip() for q in questions_text.split('\n') if q.strip() and any(c.isdigit() for c in q[:3])]
+                    questions = _Q_RE.findall(questions_text)
+                    await self._store_cached_questions(cache_file, questions)
                     return questions
                 except Exception as retry_e:
                     logger.error(f"Retry also failed: {retry_e}, cannot generate questions without LLM")
@@ -226,9 +419,41 @@ Return only the questions, numbered 1-5."""
                 raise  # Re-raise unexpected errors
         
         # Parse questions into list
-        questions = [q.strip() for q in questions_text.split('\n') if q.strip() and any(c.isdigit() for c in q[:3])]
+        questions = _Q_RE.findall(questions_text)
+        await self._store_cached_questions(cache_file, questions)
         return questions
 
+    async def _complete_questions(self, llm, prompt: str) -> str:
+        """Stream the question-generation completion and return its full text."""
+        chat_ctx = ChatContext()
+        chat_ctx.add_message(role="system", content=_QUESTION_PROMPT_PREFIX)
+        chat_ctx.add_message(role="user", content=prompt)
+        return await _collect_completion(llm, chat_ctx)
+
+    async def _load_cached_questions(self, cache_file: Path) -> list[str]:
+        """Read previously generated questions, or an empty list on a miss."""
+        try:
+            async with aiofiles.open(cache_file, 'rb') as f:
+                return orjson.loads(await f.read())
+        except FileNotFoundError:
+            return []
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable question cache {cache_file.name}: {e}")
+            return []
+
+    async def _store_cached_questions(self, cache_file: Path, questions: list[str]):
+        """Persist generated questions for reuse; failures only cost a future cache miss."""
+        if not questions:
+            return
+        try:
+            cache_file.parent.mkdir(exist_ok=True)
+            temp_file = f"{cache_file}.{uuid.uuid4().hex}.tmp"
+            async with aiofiles.open(temp_file, 'wb') as f:
+                await f.write(orjson.dumps(questions))
+            os.replace(temp_file, cache_file)
+        except Exception as e:
+            logger.warning(f"Failed to cache generated questions: {e}")
+
     def _generate_fallback_questions(self, num_questions: int) -> list[str]:
         """Generate generic fallback questions when LLM is not available"""
         fallback_questions = [
@@ -258,153 +483,585 @@ Return only the questions, numbered 1-5."""
         return selected_questions
 
 
-async def entrypoint(ctx: JobContext):
-    """Main entry point for the LiveKit agent"""
-
-    logger.info("Connecting to LiveKit room...")
-    try:
-        await ctx.connect()
-        logger.info("Successfully connected to LiveKit room")
+class InterviewTools:
+    """Function tools the interviewer LLM can call, bound to one interview session.
+
+    The tools are decorated once, when the class body runs at import, rather than
+    redefined and re-decorated for every job.
+    """
+
+    def __init__(self, assistant, session, llm):
+        self.assistant = assistant
+        self.session = session
+        self.llm = llm
+        self._reply_tasks = set()
+
+    def _speak(self, text: str):
+        """Queue a spoken reply without holding the tool result until it has played"""
+        task = asyncio.ensure_future(self.session.generate_reply(instructions=text))
+        self._reply_tasks.add(task)
+        task.add_done_callback(self._reply_done)
+
+    def _reply_done(self, task: asyncio.Future):
+        self._reply_tasks.discard(task)
+        if not task.cancelled() and task.exception():
+            logger.error(f"Failed to speak tool reply: {task.exception()}")
+
+    def all(self) -> list:
+        """Return the bound tools in registration order."""
+        return [
+            self.upload_jd,
+            self.upload_resume,
+            self.generate_questions,
+            self.ask_next_question,
+            self.get_transcript,
+            self.summarize_transcript,
+            self.end_interview
+        ]
 
-        # Enable transcription on the room
-        try:
-            ctx.room.transcription_enabled = True
-            logger.info("✅ Room transcription enabled")
-        except Exception as e:
-            logger.warning(f"⚠️ Could not enable room transcription: {e}")
+    @agents.llm.function_tool(
+        name="upload_job_description",
+        description="Upload and parse a job description document. The document should be in text or PDF format."
+    )
+    async def upload_jd(
+        self,
+        content: Annotated[str, "The job description text content"]
+    ) -> str:
+        """Process uploaded job description"""
+        self.assistant.jd_content = content
+        logger.info(f"Job description uploaded via voice: {len(content)} characters")
+        response_text = f"Thank you for providing the job description. I've carefully reviewed it and understand the key requirements for this role. It contains {len(content.split())} words covering the responsibilities, qualifications, and expectations. I'm ready to proceed with the resume upload or we can begin generating tailored interview questions if you already have the resume ready."
 
-    except Exception as e:
-        logger.error(f"Failed to connect to LiveKit room: {e}")
-        raise
+        # Generate reply - this will be captured by TTS wrapper
+        self._speak(response_text)
+        return response_text
 
-    # Initialize Anam avatar session with reconnection support
-    anam_api_key = os.getenv("ANAM_API_KEY")
-    anam_avatar = None
-    avatar_reconnect_attempts = 0
-    max_avatar_reconnect_attempts = 3
-    avatar_reconnect_task = None
+    @agents.llm.function_tool(
+        name="upload_resume",
+        description="Upload and parse a candidate's resume. The document should be in text or PDF format."
+    )
+    async def upload_resume(
+        self,
+        content: Annotated[str, "The resume text content"]
+    ) -> str:
+        """Process uploaded resume"""
+        self.assistant.resume_content = content
+        logger.info(f"Resume uploaded via voice: {len(content)} characters")
+        response_text = f"Thank you for sharing your resume. I've taken the time to carefully review your professional background, skills, and experience. The document contains {len(content.split())} words detailing your career .Would you like me to proceed with generating the questions?"
 
-    async def initialize_avatar():
-        nonlocal anam_avatar, avatar_reconnect_attempts
-        if not anam_api_key:
-            logger.warning("⚠️ ANAM_API_KEY not found - avatar will not be available")
-            return None
+        # Generate reply - this will be captured by TTS wrapper
+        self._speak(response_text)
+        return response_text
+    
+    @agents.llm.function_tool(
+        name="generate_interview_questions",
+        description="Generate interview questions based on the uploaded job description and resume."
+    )
+    async def generate_questions(self) -> str:
+        """Generate questions from JD and resume"""
+        if not self.assistant.jd_content or not self.assistant.resume_content:
+            return "I need both the job description and your resume to create meaningful, tailored interview questions. Could you please upload both documents first?"
 
         try:
-            logger.info("Initializing Anam avatar session...")
-            avatar = anam.AvatarSession(
-                persona_config=anam.PersonaConfig(
-                    name="HR Interviewer",
-                    avatarId="30fa96d0-26c4-4e55-94a0-517025942e18",  # Professional avatar ID
+            questions = await asyncio.wait_for(
+                self.assistant.generate_questions(
+                    self.assistant.jd_content,
+                    self.assistant.resume_content
                 ),
-                api_key=anam_api_key,
+                timeout=30.0  # 30 second timeout
             )
-            logger.info("✅ Anam avatar session initialized")
-            avatar_reconnect_attempts = 0  # Reset on success
-            return avatar
+            self.assistant.questions = questions
+
+            questions_text = (
+                "Based on my careful analysis of your resume and the job requirements, I've prepared the following thoughtful interview questions that will help me assess your experience and fit for this role:\n\n"
+                f"{_numbered_list(questions)}\n\n"
+                "I'm looking forward to hearing your detailed responses to these."
+            )
+
+            # Generate reply - this will be captured by TTS wrapper
+            self._speak(questions_text)
+            return questions_text
+        except asyncio.TimeoutError:
+            timeout_msg = "I'm taking longer than expected to generate questions. This might be due to high demand on the AI service. Please try again in a moment, or I can provide some general interview questions to get us started."
+            self._speak(timeout_msg)  # This will be captured by TTS wrapper
+            return timeout_msg
         except Exception as e:
-            logger.warning(f"⚠️ Failed to initialize Anam avatar: {e}")
-            return None
+            logger.error(f"Error generating questions: {e}")
+            error_msg = f"I cannot generate personalized interview questions at this time due to a technical issue: {str(e)}. Please check your OpenAI API key configuration and try again."
+            self._speak(error_msg)  # This will be captured by TTS wrapper
+            return error_msg
+    
+    @agents.llm.function_tool(
+        name="ask_next_question",
+        description="Ask the next interview question from the generated list."
+    )
+    async def ask_next_question(
+        self,
+        question_number: Annotated[int, "The question number to ask (1-5)"]
+    ) -> str:
+        """Ask a specific question"""
+        if not self.assistant.questions:
+            return "I haven't generated the interview questions yet. Let me first create thoughtful questions based on your resume and the job description."
 
-    async def reconnect_avatar():
-        nonlocal anam_avatar, avatar_reconnect_attempts, avatar_reconnect_task
-        if avatar_reconnect_attempts >= max_avatar_reconnect_attempts:
-            logger.error("❌ Max avatar reconnection attempts reached, giving up")
-            return
+        if question_number < 1 or question_number > len(self.assistant.questions):
+            return f"I can only ask questions numbered between 1 and {len(self.assistant.questions)}. Which question would you like me to ask?"
 
-        avatar_reconnect_attempts += 1
-        delay = min(2 ** avatar_reconnect_attempts, 30)  # Exponential backoff, max 30s
+        self.assistant.current_question_index = question_number - 1
+        question = self.assistant.questions[question_number - 1]
+        # Generate the spoken response
+        response_text = f"Question {question_number}: {question}"
 
-        logger.info(f"🔄 Attempting avatar reconnection {avatar_reconnect_attempts}/{max_avatar_reconnect_attempts} in {delay}s...")
+        # Generate reply - this will be captured by TTS wrapper
+        self._speak(response_text)
+        return response_text
 
-        await asyncio.sleep(delay)
+    @agents.llm.function_tool(
+        name="get_transcript",
+        description="Get the current conversation transcript of the interview."
+    )
+    async def get_transcript(self) -> str:
+        """Get formatted transcript of the conversation"""
+        if not self.assistant.transcript:
+            response_text = "No conversation has been recorded yet. The transcript will begin once we start the interview."
+        else:
+            # Format transcript for display
+            transcript_lines = []
+            transcript_lines.append("📝 **Interview Transcript**\n")
 
-        try:
-            new_avatar = await initialize_avatar()
-            if new_avatar and ctx.room:
-                logger.info("🚀 Starting reconnected avatar session...")
-                await new_avatar.start(session, room=ctx.room)
-                anam_avatar = new_avatar
-                logger.info("✅ Avatar reconnection successful")
-                avatar_reconnect_task = None
-            else:
-                logger.warning("⚠️ Avatar reconnection failed, will retry...")
-                avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
-        except Exception as e:
-            logger.error(f"❌ Avatar reconnection failed: {e}")
-            if avatar_reconnect_attempts < max_avatar_reconnect_attempts:
-                avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+            strftime, localtime = time.strftime, time.localtime
+            for entry in self.assistant.transcript:
+                speaker = entry.get('speaker', 'unknown')
+                text = entry.get('text', '')
+                entry_type = entry.get('type', 'message')
+                timestamp = entry['timestamp']
 
-    anam_avatar = await initialize_avatar()
+                # Format speaker
+                speaker_icon, speaker_name = _SPEAKER_META.get(speaker, _DEFAULT_SPEAKER)
 
-    # Load session data for this room asynchronously to avoid blocking
-    room_name = ctx.room.name
-    session_file = None
-    session_data = None
+                # Format timestamp; every append site stores a time.time() float
+                time_str = strftime('%H:%M:%S', localtime(timestamp))
 
-    # Quick synchronous check for session file to avoid timeouts
-    if os.path.exists("interview_sessions"):
-        try:
-            # Use synchronous file operations for speed - limit to avoid blocking
-            import glob
-            session_files = glob.glob(os.path.join("interview_sessions", "*.json"))
-            session_files.sort(key=os.path.getmtime, reverse=True)  # Most recent first
+                # Format message based on type
+                formatter = _TYPE_FORMATTERS.get(entry_type)
+                formatted_text = formatter(text, entry) if formatter else text
 
-            for file_path in session_files[:5]:  # Check only 5 most recent files
-                try:
-                    import aiofiles
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        data = json.loads(content)
-                    if data.get('room_name') == room_name:
-                        session_file = Path(file_path)
-                        session_data = data
-                        logger.info(f"Found session file for room {room_name}")
-                        break
-                except Exception as e:
-                    continue
-        except Exception as e:
-            logger.warning(f"Error during session file search: {e}")
+                transcript_lines.append(f"{speaker_icon} **{speaker_name}** ({time_str}): {formatted_text}")
 
-    # Create assistant instance after loading session data
-    assistant_instance = InterviewAssistant(session_file=session_file, session_data=session_data)
+            transcript_lines.append(f"\n📊 **Total Exchanges:** {len(self.assistant.transcript)}")
+            response_text = "\n".join(transcript_lines)
+
+        # Generate reply - this will be captured by TTS wrapper
+        self._speak(response_text)
+        return response_text
+
+    @agents.llm.function_tool(
+        name="summarize_transcript",
+        description="Generate an AI-powered summary of the interview transcript including key points, overall assessment, and recommendations."
+    )
+    async def summarize_transcript(self) -> str:
+        """Generate AI summary of the interview transcript"""
+        if not self.assistant.transcript:
+            response_text = "There is no transcript available to summarize. Please conduct some interview questions first before requesting a summary."
+            self._speak(response_text)  # This will be captured by TTS wrapper
+            return response_text
 
-    if session_data:
         try:
-            assistant_instance.jd_content = session_data.get('jd_full', '')
-            assistant_instance.resume_content = session_data.get('resume_full', '')
+            # Check if LLM is available
+            if not self.llm or isinstance(self.llm, MockLLM):
+                response_text = "I'm unable to generate an AI summary at this time due to service unavailability. However, I can provide you with the full transcript if you'd like to review it manually."
+                self._speak(response_text)  # This will be captured by TTS wrapper
+                return response_text
 
-            logger.info(f"Loaded session data for room {room_name}: JD={len(assistant_instance.jd_content)} chars, Resume={len(assistant_instance.resume_content)} chars")
+            # Format transcript for LLM analysis
+            transcript_text = self.assistant.transcript_text()
 
-            # Load cached questions if available
-            cached_questions = session_data.get('questions', [])
-            if cached_questions:
-                assistant_instance.questions = cached_questions
-                logger.info(f"Loaded {len(assistant_instance.questions)} cached questions for session")
+            # Create summary prompt
+            summary_prompt = f"""
+As an experienced HR professional and interview evaluator, please analyze the following interview transcript and provide a comprehensive summary.
 
-        except Exception as e:
-            logger.error(f"Failed to process session data for {room_name}: {e}")
-            assistant_instance.jd_content = ""
-            assistant_instance.resume_content = ""
-    else:
-        logger.warning(f"No session file found for room {room_name}")
-    
+INTERVIEW TRANSCRIPT:
+{transcript_text}
+
+Please provide a structured summary that includes:
+
+1. **Key Points**: Main topics discussed and important information shared
+2. **Overall Assessment**: Your evaluation of the candidate's performance, communication skills, and fit for the role
+3. **Strengths**: Notable strengths demonstrated by the candidate
+4. **Areas for Improvement**: Any areas where the candidate could develop further
+5. **Recommendations**: Specific recommendations for next steps or follow-up
+
+Format your response in a clear, professional manner suitable for both voice delivery and written reports. Keep the summary concise but comprehensive, focusing on actionable insights.
+
+If the transcript is too short or incomplete, note this in your assessment.
+"""
+
+            # Generate summary using LLM
+            chat_ctx = ChatContext()
+            chat_ctx.add_message(role="system", content="You are an expert HR interviewer providing detailed interview analysis and feedback.")
+            chat_ctx.add_message(role="user", content=summary_prompt)
+
+            summary_text = await _collect_completion(self.llm, chat_ctx)
+
+            # Format response for voice output
+            response_text = f"Based on my analysis of the interview transcript, here's a comprehensive summary:\n\n{summary_text}\n\nThis assessment is based on {len(self.assistant.transcript)} exchanges in the conversation."
+
+
+
+            # Generate reply - this will be captured by TTS wrapper
+            self._speak(response_text)
+            return response_text
+
+        except asyncio.TimeoutError:
+            timeout_msg = "The summary generation is taking longer than expected. This might be due to high demand on the AI service. Please try again in a moment."
+            self._speak(timeout_msg)  # This will be captured by TTS wrapper
+            return timeout_msg
+        except Exception as e:
+            logger.error(f"Error generating transcript summary: {e}")
+            error_msg = "I encountered an issue while generating the summary. Please check your OpenAI API key configuration and try again, or I can provide the full transcript for manual review."
+            self._speak(error_msg)  # This will be captured by TTS wrapper
+            return error_msg
+
+    @agents.llm.function_tool(
+        name="end_interview",
+        description="End the interview session, generate a final summary report, and update session status to completed."
+    )
+    async def end_interview(self) -> str:
+        """End the interview and generate final summary report"""
+        if not self.assistant.transcript:
+            response_text = "There is no transcript available to summarize. The interview cannot be ended without any recorded conversation."
+            self._speak(response_text)
+            return response_text
+
+        # Check if there are meaningful candidate responses (more than just greeting)
+        candidate_responses = [entry for entry in self.assistant.transcript if entry.get('speaker') == 'candidate']
+        if len(candidate_responses) < 2:  # Less than 2 candidate responses suggests incomplete interview
+            response_text = "The interview appears to be incomplete with very limited candidate responses. While I can still provide an assessment based on the available information, I recommend conducting a more comprehensive interview for better evaluation. Would you like me to proceed with the available data or continue the interview?"
+            self._speak(response_text)
+            return response_text
+
+        try:
+            # Check if LLM is available for final summary
+            if not self.llm or isinstance(self.llm, MockLLM):
+                response_text = "I'm unable to generate a final AI summary at this time due to service unavailability. However, the interview will be marked as completed and you can review the full transcript manually."
+                self._speak(response_text)
+
+                # Still update session status even without AI summary
+                await self._update_session_completed()
+                return response_text
+
+            # Format transcript for LLM analysis
+            transcript_text = self.assistant.transcript_text()
+
+            # Get the generated questions for evaluation context
+            questions_context = ""
+            if self.assistant.questions:
+                questions_context = f"\n\nINTERVIEW QUESTIONS ASKED:\n{_numbered_list(self.assistant.questions)}"
+
+            # Create comprehensive final summary prompt
+            final_summary_prompt = f"""
+As an expert HR interviewer, analyze the following complete interview transcript and provide a comprehensive final assessment report.
+
+{questions_context}
+
+COMPLETE INTERVIEW TRANSCRIPT:
+{transcript_text}
+
+Please provide a detailed final summary that includes:
+
+1. **Overall Recommendation**: Selected/Not Selected/Further Review with justification
+2. **Performance Scores** (out of 10):
+   - Technical Fit: /10
+   - Experience: /10
+   - Communication: /10
+   - Problem-Solving: /10
+   - Culture Fit: /10
+3. **Question-by-Question Assessment**: Evaluate how well the candidate answered each of the interview questions, noting specific strengths and areas for improvement
+4. **Key Strengths**: 3-5 most notable strengths demonstrated
+5. **Concerns/Weaknesses**: Areas that need improvement or development
+6. **Detailed Hiring Recommendation**: Comprehensive assessment for HR decision-making
+
+Format your response as a professional interview assessment report suitable for HR records and managerial review. Be thorough but concise, focusing on actionable insights that will inform the hiring decision.
+
+This is the FINAL assessment - provide your most comprehensive and definitive evaluation.
+"""
+
+            # Generate final summary using LLM
+            chat_ctx = ChatContext()
+            chat_ctx.add_message(role="system", content="You are a senior HR professional providing the final comprehensive evaluation of a candidate after a complete interview process.")
+            chat_ctx.add_message(role="user", content=final_summary_prompt)
+
+            final_summary_text = await _collect_completion(self.llm, chat_ctx)
+
+            # Update session status to completed
+            await self._update_session_completed()
+
+            # Format response for voice output
+            response_text = f"Thank you for participating in this interview. The interview has now been completed and I've generated a comprehensive final assessment report:\n\n{final_summary_text}\n\nThis concludes our interview session. Your responses have been carefully evaluated, and this assessment will be saved for HR review. Thank you for your time and candor throughout the process."
+
+            # Generate reply - this will be captured by TTS wrapper
+            self._speak(response_text)
+            return response_text
+
+        except asyncio.TimeoutError:
+            timeout_msg = "The final summary generation is taking longer than expected. The interview will still be marked as completed, and you can access the full transcript and basic assessment through the dashboard."
+            self._speak(timeout_msg)
+
+            # Update session status even on timeout
+            await self._update_session_completed()
+            return timeout_msg
+        except Exception as e:
+            logger.error(f"Error generating final interview summary: {e}")
+            error_msg = "I encountered an issue while generating the final summary. However, the interview has been marked as completed and you can review all materials through the dashboard."
+            self._speak(error_msg)
+
+            # Update session status even on error
+            await self._update_session_completed()
+            return error_msg
+
+    async def _update_session_completed(self):
+        """Helper function to update session status to completed with retry logic"""
+        if not self.assistant.session_file:
+            logger.warning("No session file available to update completion status")
+            return
+
+        # Land pending transcript entries and the completion status in a single
+        # read-modify-write of the session file; the file is re-read rather than
+        # rewritten from memory because the web process updates it too
+        now = datetime.now().isoformat()
+        if await self.assistant.flush_transcript(
+            status='completed',
+            completed_at=now,
+            updated_at=now
+        ):
+            logger.info(f"✅ Interview session {self.assistant.session_id} marked as completed")
+        else:
+            logger.error(f"Failed to update session completion status for {self.assistant.session_id}")
+
+
+async def _cancel_pending_rpcs(participant) -> int:
+    """Cancel RPC futures still pending on a participant; returns how many there were"""
+    try:
+        pending = getattr(participant, '_pending_rpcs', None)
+        if not pending:
+            return 0
+        futures = tuple(pending.values())
+        # cancel() is a no-op on futures that already finished
+        for future in futures:
+            future.cancel()
+        # Reap them all in one pass so their cancellation doesn't surface later
+        await asyncio.gather(*futures, return_exceptions=True)
+        return len(futures)
+    except Exception as e:
+        logger.debug(f"RPC cleanup error (non-critical): {e}")
+        return 0
+
+
+def prewarm(proc: JobProcess):
+    """Import the configured provider plugins and load the Silero VAD model once per
+    worker process, before any job is assigned"""
+    for name, key in _PLUGIN_KEYS.items():
+        if key is None or ENV[key]:
+            try:
+                _plugin(name)
+            except Exception as e:
+                logger.warning(f"Failed to import {name} plugin: {e}")
+    try:
+        proc.userdata["vad"] = _plugin("silero").VAD.load()
+    except Exception as e:
+        logger.warning(f"Silero VAD preload failed, sessions will load it on demand: {e}")
+
+
+async def entrypoint(ctx: JobContext):
+    """Main entry point for the LiveKit agent"""
+
+    logger.info("Connecting to LiveKit room...")
+    try:
+        await ctx.connect()
+        logger.info("Successfully connected to LiveKit room")
+
+        # Enable transcription on the room
+        try:
+            ctx.room.transcription_enabled = True
+            logger.info("✅ Room transcription enabled")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not enable room transcription: {e}")
+
+    except Exception as e:
+        logger.error(f"Failed to connect to LiveKit room: {e}")
+        raise
+
+    # Initialize Anam avatar session with reconnection support
+    anam_api_key = ENV["ANAM_API_KEY"]
+    anam_avatar = None
+    avatar_reconnect_attempts = 0
+    max_avatar_reconnect_attempts = 3
+    avatar_reconnect_task = None
+
+    async def initialize_avatar():
+        nonlocal anam_avatar, avatar_reconnect_attempts
+        if not anam_api_key:
+            logger.warning("⚠️ ANAM_API_KEY not found - avatar will not be available")
+            return None
+
+        try:
+            logger.info("Initializing Anam avatar session...")
+            avatar = _plugin("anam").AvatarSession(
+                persona_config=_plugin("anam").PersonaConfig(
+                    name="HR Interviewer",
+                    avatarId="30fa96d0-26c4-4e55-94a0-517025942e18",  # Professional avatar ID
+                ),
+                api_key=anam_api_key,
+            )
+            logger.info("✅ Anam avatar session initialized")
+            avatar_reconnect_attempts = 0  # Reset on success
+            return avatar
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to initialize Anam avatar: {e}")
+            return None
+
+    async def reconnect_avatar():
+        nonlocal anam_avatar, avatar_reconnect_attempts, avatar_reconnect_task
+        if avatar_reconnect_attempts >= max_avatar_reconnect_attempts:
+            logger.error("❌ Max avatar reconnection attempts reached, giving up")
+            return
+
+        avatar_reconnect_attempts += 1
+        delay = min(2 ** avatar_reconnect_attempts, 30)  # Exponential backoff, max 30s
+
+        logger.info(f"🔄 Attempting avatar reconnection {avatar_reconnect_attempts}/{max_avatar_reconnect_attempts} in {delay}s...")
+
+        await asyncio.sleep(delay)
+
+        try:
+            new_avatar = await initialize_avatar()
+            if new_avatar and ctx.room:
+                logger.info("🚀 Starting reconnected avatar session...")
+                await new_avatar.start(session, room=ctx.room)
+                anam_avatar = new_avatar
+                logger.info("✅ Avatar reconnection successful")
+                avatar_reconnect_task = None
+            else:
+                logger.warning("⚠️ Avatar reconnection failed, will retry...")
+                avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+        except Exception as e:
+            logger.error(f"❌ Avatar reconnection failed: {e}")
+            if avatar_reconnect_attempts < max_avatar_reconnect_attempts:
+                avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+
+    def schedule_avatar_reconnect():
+        """Start avatar reconnection unless an attempt is already in flight"""
+        nonlocal avatar_reconnect_task
+        if anam_api_key and (not avatar_reconnect_task or avatar_reconnect_task.done()):
+            avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+
+    room_name = ctx.room.name
+
+    async def find_session():
+        """Resolve the room's session through the room index written by the web app"""
+        if not os.path.exists("interview_sessions"):
+            return None, None
+        try:
+            session_service = InterviewSessionService("interview_sessions")
+            session_data = await session_service.get_session_by_room(room_name)
+            if session_data:
+                logger.info(f"Found session file for room {room_name}")
+                return Path(session_service.sessions_dir) / f"{session_data['session_id']}.json", session_data
+        except Exception as e:
+            logger.warning(f"Error during session file search: {e}")
+        return None, None
+
+    async def init_llm():
+        """Setup LLM with fallback"""
+        llm = None
+        openai_key = ENV["OPENAI_API_KEY"]
+        if openai_key:
+            try:
+                llm = _get_llm(openai_key)
+                logger.info("LiveKit OpenAI LLM (gpt-4o-mini) initialized successfully")
+            except Exception as e:
+                error_details = str(e) if str(e) else type(e).__name__
+                logger.warning(f"OpenAI LLM initialization failed ({error_details}) - using fallback")
+                llm = MockLLM()
+        else:
+            logger.warning("No OpenAI API key found, using fallback LLM")
+            llm = MockLLM()
+        return llm
+
+    async def test_llm_connectivity(llm):
+        """Log whether the LLM answers; the result is informational only"""
+        test_ctx = ChatContext()
+        test_ctx.add_message(role="user", content="Hello")
+        try:
+            async def test_chat():
+                response_received = False
+                async with llm.chat(chat_ctx=test_ctx) as stream:
+                    async for chunk in stream:
+                        if getattr(chunk.delta, 'content', None):
+                            response_received = True
+                            break
+                return response_received
+            test_result = await asyncio.wait_for(test_chat(), timeout=10.0)
+            if test_result:
+                logger.info("LLM connectivity test passed")
+            else:
+                logger.warning("LLM connectivity test incomplete - proceeding anyway")
+        except asyncio.TimeoutError:
+            logger.warning("LLM connectivity test timed out - proceeding anyway")
+        except Exception as e:
+            error_details = str(e) if str(e) else type(e).__name__
+            logger.warning(f"LLM connectivity test failed ({error_details}) - proceeding anyway")
+
+    # Avatar, session lookup and LLM setup are independent network/disk I/O; overlap them
+    anam_avatar, (session_file, session_data), llm = await asyncio.gather(
+        initialize_avatar(), find_session(), init_llm()
+    )
+
+    # The connectivity test never changed the outcome, so run it alongside startup
+    # instead of gating the session on a full LLM round trip
+    llm_test_task = None
+    if not isinstance(llm, MockLLM):
+        llm_test_task = asyncio.create_task(test_llm_connectivity(llm))
+
+    # Create assistant instance after loading session data
+    assistant_instance = InterviewAssistant(session_file=session_file, session_data=session_data)
+    ctx.add_shutdown_callback(assistant_instance.flush_transcript)
+
+    if session_data:
+        try:
+            assistant_instance.jd_content = session_data.get('jd_full', '')
+            assistant_instance.resume_content = session_data.get('resume_full', '')
+
+            logger.info(f"Loaded session data for room {room_name}: JD={len(assistant_instance.jd_content)} chars, Resume={len(assistant_instance.resume_content)} chars")
+
+            # Load cached questions if available
+            cached_questions = session_data.get('questions', [])
+            if cached_questions:
+                assistant_instance.questions = cached_questions
+                logger.info(f"Loaded {len(assistant_instance.questions)} cached questions for session")
+
+        except Exception as e:
+            logger.error(f"Failed to process session data for {room_name}: {e}")
+            assistant_instance.jd_content = ""
+            assistant_instance.resume_content = ""
+    else:
+        logger.warning(f"No session file found for room {room_name}")
+    
     # Setup STT (Speech-to-Text) with OpenAI primary and Deepgram fallback
     # Optimized for accurate candidate speech transcription
-    openai_key = os.getenv("OPENAI_API_KEY")
+    openai_key = ENV["OPENAI_API_KEY"]
     stt = None
     if openai_key:
         try:
             # OpenAI STT with basic configuration (language defaults to auto-detection)
-            stt = openai.STT(api_key=openai_key)
+            stt = _plugin("openai").STT(api_key=openai_key)
             logger.info("LiveKit OpenAI STT initialized successfully")
         except Exception as e:
             logger.warning(f"OpenAI STT initialization failed: {e}, trying Deepgram fallback")
             try:
-                deepgram_key = os.getenv("DEEPGRAM_API_KEY")
+                deepgram_key = ENV["DEEPGRAM_API_KEY"]
                 if deepgram_key:
                     # Deepgram STT with enhanced accuracy settings
-                    stt = deepgram.STT(
+                    stt = _plugin("deepgram").STT(
                         api_key=deepgram_key,
                         model="nova-3",  # Latest high-accuracy model
                         language="en-US",  # US English for precision
@@ -420,11 +1077,11 @@ async def entrypoint(ctx: JobContext):
                 stt = None
     else:
         logger.warning("No OpenAI API key found, trying Deepgram STT")
-        deepgram_key = os.getenv("DEEPGRAM_API_KEY")
+        deepgram_key = ENV["DEEPGRAM_API_KEY"]
         if deepgram_key:
             try:
                 # Deepgram STT with enhanced accuracy settings
-                stt = deepgram.STT(
+                stt = _plugin("deepgram").STT(
                     api_key=deepgram_key,
                     model="nova-3",  # Latest high-accuracy model
                     language="en-US",  # US English for precision
@@ -462,621 +1119,192 @@ async def entrypoint(ctx: JobContext):
     # CRITICAL: Ensure STT is available for transcription
     if not stt:
         logger.error("STT service unavailable - transcription will not work")
-        raise RuntimeError("STT service required for transcription. Please check OPENAI_API_KEY or DEEPGRAM_API_KEY environment variables.")
-
-    # Store STT reference for later use (will be set after wrapper creation)
-    stt_instance = None
-    
-    # Setup LLM with fallback
-    llm = None
-    openai_key = os.getenv("OPENAI_API_KEY")
-    if openai_key:
-        try:
-            llm = openai.LLM(model="gpt-4o-mini", api_key=openai_key)
-            logger.info("LiveKit OpenAI LLM (gpt-4o-mini) initialized successfully")
-
-            test_ctx = ChatContext()
-            test_ctx.add_message(role="user", content="Hello")
-            try:
-                async def test_chat():
-                    response_received = False
-                    async with llm.chat(chat_ctx=test_ctx) as stream:
-                        async for chunk in stream:
-                            if chunk.delta and hasattr(chunk.delta, 'content') and chunk.delta.content:
-                                response_received = True
-                                break
-                    return response_received
-                test_result = await asyncio.wait_for(test_chat(), timeout=10.0)
-                if test_result:
-                    logger.info("LLM connectivity test passed")
-                else:
-                    logger.warning("LLM connectivity test incomplete - proceeding anyway")
-            except asyncio.TimeoutError:
-                logger.warning("LLM connectivity test timed out - proceeding anyway")
-            except Exception as e:
-                error_details = str(e) if str(e) else type(e).__name__
-                logger.warning(f"LLM connectivity test failed ({error_details}) - proceeding anyway")
-        except Exception as e:
-            error_details = str(e) if str(e) else type(e).__name__
-            logger.warning(f"OpenAI LLM initialization failed ({error_details}) - using fallback")
-            llm = MockLLM()
-    else:
-        logger.warning("No OpenAI API key found, using fallback LLM")
-        llm = MockLLM()
-
-    # Setup TTS (Text-to-Speech) with fallback
-    tts_plugin = None
-    if openai_key:
-        try:
-            tts_plugin = openai.TTS(voice="alloy", api_key=openai_key)
-            logger.info("LiveKit OpenAI TTS initialized successfully with 'alloy' voice")
-        except Exception as e:
-            logger.warning(f"OpenAI TTS initialization failed: {e}, trying ElevenLabs fallback")
-            tts_plugin = None
-
-    if not tts_plugin:
-        elevenlabs_key = os.getenv("ELEVENLABS_API_KEY")
-        if elevenlabs_key:
-            try:
-                tts_plugin = elevenlabs.TTS(api_key=elevenlabs_key)
-                logger.info("LiveKit ElevenLabs TTS initialized as fallback")
-            except Exception as e:
-                logger.warning(f"ElevenLabs TTS fallback failed: {e}")
-                tts_plugin = None
-        else:
-            logger.warning("No ElevenLabs API key found - TTS unavailable")
-            tts_plugin = None
-
-    # Wrap TTS to capture agent speech for transcription
-    class TranscriptionTTS:
-        def __init__(self, tts, assistant_instance):
-            self.tts = tts
-            self.assistant_instance = assistant_instance
-
-        def synthesize(self, *args, **kwargs):
-            # Capture the text before synthesis for agent speech
-            text = args[0] if args else kwargs.get('text', '')
-            if text:
-                # Capture agent speech in transcript
-                transcript_entry = {
-                    'speaker': 'agent',
-                    'text': text,
-                    'timestamp': datetime.now().timestamp(),
-                    'type': 'message'
-                }
-                self.assistant_instance.transcript.append(transcript_entry)
-                logger.info(f"📝 Captured agent speech: {text[:50]}...")
-
-                # Save transcript to session file immediately
-                asyncio.create_task(self.assistant_instance.save_transcript_to_session())
-
-            # Return the original TTS synthesize method (async context manager)
-            return self.tts.synthesize(*args, **kwargs)
-
-        # Delegate other attributes to the wrapped TTS
-        def __getattr__(self, name):
-            return getattr(self.tts, name)
-
-    if tts_plugin:
-        tts_plugin = TranscriptionTTS(tts_plugin, assistant_instance)
-
-    # Create AgentSession with service availability checks
-    if not tts_plugin:
-        logger.error("TTS service unavailable - cannot start voice assistant")
-        raise RuntimeError("TTS service not available. Please check API keys and service configuration.")
-    if not stt:
-        logger.error("STT service unavailable - transcription will not work")
-        raise RuntimeError("STT service required for transcription. Please check OPENAI_API_KEY or DEEPGRAM_API_KEY environment variables.")
-    if not llm:
-        logger.warning("LLM service unavailable - using fallback responses")
-
-    logger.info("🔧 Creating AgentSession with transcription settings...")
-
-    # Wrap STT to capture candidate speech for transcription with VAD and error handling
-    class TranscriptionSTT:
-        def __init__(self, stt, assistant_instance):
-            self.stt = stt
-            self.assistant_instance = assistant_instance
-            self.retry_count = 0
-            self.max_retries = 3
-            # Initialize WebRTC VAD for voice activity detection
-            self.vad = webrtcvad.Vad()
-            self.vad.set_mode(3)  # Most aggressive filtering for clean speech
-            self.audio_buffer = []
-            self.speech_detected = False
-            self.frame_duration = 30  # 30ms frames for VAD
-            self.sample_rate = 16000  # 16kHz sample rate
-
-        async def recognize(self, *args, **kwargs):
-            for attempt in range(self.max_retries):
-                try:
-                    result = await self.stt.recognize(*args, **kwargs)
-
-                    # Reset retry count on success
-                    self.retry_count = 0
-
-                    # Handle different STT result formats
-                    text = None
-                    if hasattr(result, 'text') and result.text:
-                        text = result.text
-                    elif hasattr(result, 'alternatives') and result.alternatives:
-                        # Some STT services return alternatives
-                        text = result.alternatives[0].text if result.alternatives[0].text else None
-                    elif isinstance(result, str):
-                        text = result
-
-                    if text:
-                        # Apply VAD filtering - only capture if speech was detected
-                        if self._is_speech_likely(text):
-                            # Capture candidate speech in transcript
-                            transcript_entry = {
-                                'speaker': 'candidate',
-                                'text': text,
-                                'timestamp': datetime.now().timestamp(),
-                                'type': 'message'
-                            }
-                            self.assistant_instance.transcript.append(transcript_entry)
-                            logger.info(f"📝 Captured candidate speech (VAD filtered): {text[:50]}...")
-
-                            # Save transcript to session file immediately
-                            asyncio.create_task(self.assistant_instance.save_transcript_to_session())
-                        else:
-                            logger.debug(f"🗣️ Speech detected but filtered by VAD: {text[:30]}...")
-
-                    return result
-
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    is_retryable = any(keyword in error_msg for keyword in [
-                        '500', 'internal', 'server error', 'timeout', 'connection',
-                        'network', 'api', 'rate limit'
-                    ])
-
-                    if is_retryable and attempt < self.max_retries - 1:
-                        wait_time = min(0.1 * (2 ** attempt), 2.0)  # Exponential backoff, max 2s
-                        logger.warning(f"STT error (attempt {attempt + 1}/{self.max_retries}): {e}, retrying in {wait_time}s...")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    else:
-                        logger.error(f"STT failed after {self.max_retries} attempts: {e}")
-                        # Return empty result to prevent crashes
-                        return type('EmptyResult', (), {'text': '', 'alternatives': []})()
-
-            # This should never be reached, but just in case
-            return type('EmptyResult', (), {'text': '', 'alternatives': []})()
-
-        def _is_speech_likely(self, text):
-            """Use heuristics to determine if text is likely actual speech vs noise"""
-            if not text or len(text.strip()) < 2:
-                return False
-
-            # Filter out very short or nonsensical responses
-            text_lower = text.lower().strip()
-
-            # Common false positives from STT
-            noise_patterns = [
-                'thank you', 'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-                'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-                'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-                'um', 'uh', 'er', 'ah', 'like', 'you know', 'i mean', 'so', 'well', 'okay',
-                'yeah', 'yes', 'no', 'hi', 'hello', 'hey', 'bye', 'goodbye', 'please', 'sorry'
-            ]
-
-            # If text is only noise words, likely not actual speech
-            words = text_lower.split()
-            if len(words) <= 3 and all(word in noise_patterns for word in words):
-                return False
-
-            # If text is very short and contains only articles/prepositions, likely noise
-            if len(text_lower) <= 10 and all(word in ['the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'] for word in words):
-                return False
-
-            return True
-
-        # Delegate other attributes to the wrapped STT
-        def __getattr__(self, name):
-            return getattr(self.stt, name)
-
-    wrapped_stt = TranscriptionSTT(stt, assistant_instance)
-
-    session = AgentSession(
-        stt=wrapped_stt,
-        llm=llm,
-        tts=tts_plugin,
-        vad=silero.VAD.load(),
-        use_tts_aligned_transcript=True,
-    )
-
-    # Verify session was created with STT
-    if hasattr(session, '_stt') and session._stt:
-        logger.info("✅ AgentSession created with STT enabled")
-    else:
-        logger.warning("⚠️ AgentSession may not have STT properly configured")
-
-
-    
-    # Define function for document processing
-    @agents.llm.function_tool(
-        name="upload_job_description",
-        description="Upload and parse a job description document. The document should be in text or PDF format."
-    )
-    async def upload_jd(
-        content: Annotated[str, "The job description text content"]
-    ) -> str:
-        """Process uploaded job description"""
-        assistant_instance.jd_content = content
-        logger.info(f"Job description uploaded via voice: {len(content)} characters")
-        response_text = f"Thank you for providing the job description. I've carefully reviewed it and understand the key requirements for this role. It contains {len(content.split())} words covering the responsibilities, qualifications, and expectations. I'm ready to proceed with the resume upload or we can begin generating tailored interview questions if you already have the resume ready."
-
-        # Generate reply - this will be captured by TTS wrapper
-        reply_result = await session.generate_reply(instructions=response_text)
-        return response_text
-
-    @agents.llm.function_tool(
-        name="upload_resume",
-        description="Upload and parse a candidate's resume. The document should be in text or PDF format."
-    )
-    async def upload_resume(
-        content: Annotated[str, "The resume text content"]
-    ) -> str:
-        """Process uploaded resume"""
-        assistant_instance.resume_content = content
-        logger.info(f"Resume uploaded via voice: {len(content)} characters")
-        response_text = f"Thank you for sharing your resume. I've taken the time to carefully review your professional background, skills, and experience. The document contains {len(content.split())} words detailing your career .Would you like me to proceed with generating the questions?"
-
-        # Generate reply - this will be captured by TTS wrapper
-        reply_result = await session.generate_reply(instructions=response_text)
-        return response_text
-    
-    @agents.llm.function_tool(
-        name="generate_interview_questions",
-        description="Generate interview questions based on the uploaded job description and resume."
-    )
-    async def generate_questions() -> str:
-        """Generate questions from JD and resume"""
-        if not assistant_instance.jd_content or not assistant_instance.resume_content:
-            return "I need both the job description and your resume to create meaningful, tailored interview questions. Could you please upload both documents first?"
-
-        try:
-            questions = await asyncio.wait_for(
-                assistant_instance.generate_questions(
-                    assistant_instance.jd_content,
-                    assistant_instance.resume_content
-                ),
-                timeout=30.0  # 30 second timeout
-            )
-            assistant_instance.questions = questions
-
-            questions_text = "Based on my careful analysis of your resume and the job requirements, I've prepared the following thoughtful interview questions that will help me assess your experience and fit for this role:\n\n"
-            questions_text += "\n".join([f"{i+1}. {q}" for i, q in enumerate(questions)])
-            questions_text += "\n\nI'm looking forward to hearing your detailed responses to these."
-
-            # Generate reply - this will be captured by TTS wrapper
-            reply_result = await session.generate_reply(instructions=questions_text)
-            return questions_text
-        except asyncio.TimeoutError:
-            timeout_msg = "I'm taking longer than expected to generate questions. This might be due to high demand on the AI service. Please try again in a moment, or I can provide some general interview questions to get us started."
-            await session.generate_reply(instructions=timeout_msg)  # This will be captured by TTS wrapper
-            return timeout_msg
-        except Exception as e:
-            logger.error(f"Error generating questions: {e}")
-            error_msg = f"I cannot generate personalized interview questions at this time due to a technical issue: {str(e)}. Please check your OpenAI API key configuration and try again."
-            await session.generate_reply(instructions=error_msg)  # This will be captured by TTS wrapper
-            return error_msg
-    
-    @agents.llm.function_tool(
-        name="ask_next_question",
-        description="Ask the next interview question from the generated list."
-    )
-    async def ask_next_question(
-        question_number: Annotated[int, "The question number to ask (1-5)"]
-    ) -> str:
-        """Ask a specific question"""
-        if not assistant_instance.questions:
-            return "I haven't generated the interview questions yet. Let me first create thoughtful questions based on your resume and the job description."
-
-        if question_number < 1 or question_number > len(assistant_instance.questions):
-            return f"I can only ask questions numbered between 1 and {len(assistant_instance.questions)}. Which question would you like me to ask?"
-
-        assistant_instance.current_question_index = question_number - 1
-        question = assistant_instance.questions[question_number - 1]
-        question_text = f"Question {question_number}: {question}"
-
-        # Generate the spoken response
-        response_text = f"Question {question_number}: {question}"
-
-        # Generate reply - this will be captured by TTS wrapper
-        reply_result = await session.generate_reply(instructions=response_text)
-        return response_text
-
-    @agents.llm.function_tool(
-        name="get_transcript",
-        description="Get the current conversation transcript of the interview."
-    )
-    async def get_transcript() -> str:
-        """Get formatted transcript of the conversation"""
-        if not assistant_instance.transcript:
-            response_text = "No conversation has been recorded yet. The transcript will begin once we start the interview."
-        else:
-            # Format transcript for display
-            transcript_lines = []
-            transcript_lines.append("📝 **Interview Transcript**\n")
-
-            for entry in assistant_instance.transcript:
-                speaker = entry.get('speaker', 'unknown')
-                text = entry.get('text', '')
-                entry_type = entry.get('type', 'message')
-                timestamp = entry.get('timestamp', 0)
-
-                # Format speaker
-                if speaker == 'agent':
-                    speaker_icon = "🤖"
-                    speaker_name = "Interviewer"
-                else:
-                    # Default to candidate for any non-agent speaker
-                    speaker_icon = "👤"
-                    speaker_name = "Candidate"
-
-                # Format timestamp
-                if isinstance(timestamp, (int, float)):
-                    import time
-                    time_str = time.strftime('%H:%M:%S', time.localtime(timestamp))
-                else:
-                    time_str = "00:00:00"
-
-                # Format message based on type
-                if entry_type == 'greeting':
-                    formatted_text = f"*{text}*"
-                elif entry_type == 'question':
-                    question_num = entry.get('question_number', '')
-                    formatted_text = f"**Question {question_num}:** {text}"
-                else:
-                    formatted_text = text
-
-                transcript_lines.append(f"{speaker_icon} **{speaker_name}** ({time_str}): {formatted_text}")
-
-            transcript_lines.append(f"\n📊 **Total Exchanges:** {len(assistant_instance.transcript)}")
-            response_text = "\n".join(transcript_lines)
-
-        # Generate reply - this will be captured by TTS wrapper
-        reply_result = await session.generate_reply(instructions=response_text)
-        return response_text
-
-    @agents.llm.function_tool(
-        name="summarize_transcript",
-        description="Generate an AI-powered summary of the interview transcript including key points, overall assessment, and recommendations."
-    )
-    async def summarize_transcript() -> str:
-        """Generate AI summary of the interview transcript"""
-        if not assistant_instance.transcript:
-            response_text = "There is no transcript available to summarize. Please conduct some interview questions first before requesting a summary."
-            await session.generate_reply(instructions=response_text)  # This will be captured by TTS wrapper
-            return response_text
-
-        try:
-            # Check if LLM is available
-            if not llm or isinstance(llm, MockLLM):
-                response_text = "I'm unable to generate an AI summary at this time due to service unavailability. However, I can provide you with the full transcript if you'd like to review it manually."
-                await session.generate_reply(instructions=response_text)  # This will be captured by TTS wrapper
-                return response_text
-
-            # Format transcript for LLM analysis
-            transcript_text = ""
-            for entry in assistant_instance.transcript:
-                speaker = entry.get('speaker', 'unknown')
-                text = entry.get('text', '')
-                speaker_name = "Interviewer" if speaker == 'agent' else "Candidate"
-                transcript_text += f"{speaker_name}: {text}\n"
-
-            # Create summary prompt
-            summary_prompt = f"""
-As an experienced HR professional and interview evaluator, please analyze the following interview transcript and provide a comprehensive summary.
-
-INTERVIEW TRANSCRIPT:
-{transcript_text}
-
-Please provide a structured summary that includes:
-
-1. **Key Points**: Main topics discussed and important information shared
-2. **Overall Assessment**: Your evaluation of the candidate's performance, communication skills, and fit for the role
-3. **Strengths**: Notable strengths demonstrated by the candidate
-4. **Areas for Improvement**: Any areas where the candidate could develop further
-5. **Recommendations**: Specific recommendations for next steps or follow-up
-
-Format your response in a clear, professional manner suitable for both voice delivery and written reports. Keep the summary concise but comprehensive, focusing on actionable insights.
-
-If the transcript is too short or incomplete, note this in your assessment.
-"""
-
-            # Generate summary using LLM
-            chat_ctx = ChatContext()
-            chat_ctx.add_message(role="system", content="You are an expert HR interviewer providing detailed interview analysis and feedback.")
-            chat_ctx.add_message(role="user", content=summary_prompt)
-
-            summary_text = ""
-            async with llm.chat(chat_ctx=chat_ctx) as stream:
-                async for chunk in stream:
-                    if chunk.delta and hasattr(chunk.delta, 'content'):
-                        summary_text += chunk.delta.content or ""
-
-            # Format response for voice output
-            response_text = f"Based on my analysis of the interview transcript, here's a comprehensive summary:\n\n{summary_text}\n\nThis assessment is based on {len(assistant_instance.transcript)} exchanges in the conversation."
-
-
-
-            # Generate reply - this will be captured by TTS wrapper
-            reply_result = await session.generate_reply(instructions=response_text)
-            return response_text
-
-        except asyncio.TimeoutError:
-            timeout_msg = "The summary generation is taking longer than expected. This might be due to high demand on the AI service. Please try again in a moment."
-            await session.generate_reply(instructions=timeout_msg)  # This will be captured by TTS wrapper
-            return timeout_msg
+        raise RuntimeError("STT service required for transcription. Please check OPENAI_API_KEY or DEEPGRAM_API_KEY environment variables.")
+
+    # Store STT reference for later use (will be set after wrapper creation)
+    stt_instance = None
+    
+    # Setup TTS (Text-to-Speech) with fallback
+    tts_plugin = None
+    if openai_key:
+        try:
+            tts_plugin = _plugin("openai").TTS(voice="alloy", api_key=openai_key)
+            logger.info("LiveKit OpenAI TTS initialized successfully with 'alloy' voice")
         except Exception as e:
-            logger.error(f"Error generating transcript summary: {e}")
-            error_msg = "I encountered an issue while generating the summary. Please check your OpenAI API key configuration and try again, or I can provide the full transcript for manual review."
-            await session.generate_reply(instructions=error_msg)  # This will be captured by TTS wrapper
-            return error_msg
+            logger.warning(f"OpenAI TTS initialization failed: {e}, trying ElevenLabs fallback")
+            tts_plugin = None
 
-    @agents.llm.function_tool(
-        name="end_interview",
-        description="End the interview session, generate a final summary report, and update session status to completed."
-    )
-    async def end_interview() -> str:
-        """End the interview and generate final summary report"""
-        if not assistant_instance.transcript:
-            response_text = "There is no transcript available to summarize. The interview cannot be ended without any recorded conversation."
-            await session.generate_reply(instructions=response_text)
-            return response_text
+    if not tts_plugin:
+        elevenlabs_key = ENV["ELEVENLABS_API_KEY"]
+        if elevenlabs_key:
+            try:
+                tts_plugin = _plugin("elevenlabs").TTS(api_key=elevenlabs_key)
+                logger.info("LiveKit ElevenLabs TTS initialized as fallback")
+            except Exception as e:
+                logger.warning(f"ElevenLabs TTS fallback failed: {e}")
+                tts_plugin = None
+        else:
+            logger.warning("No ElevenLabs API key found - TTS unavailable")
+            tts_plugin = None
 
-        # Check if there are meaningful candidate responses (more than just greeting)
-        candidate_responses = [entry for entry in assistant_instance.transcript if entry.get('speaker') == 'candidate']
-        if len(candidate_responses) < 2:  # Less than 2 candidate responses suggests incomplete interview
-            response_text = "The interview appears to be incomplete with very limited candidate responses. While I can still provide an assessment based on the available information, I recommend conducting a more comprehensive interview for better evaluation. Would you like me to proceed with the available data or continue the interview?"
-            await session.generate_reply(instructions=response_text)
-            return response_text
+    # Wrap TTS to capture agent speech for transcription
+    class TranscriptionTTS:
+        def __init__(self, tts, assistant_instance):
+            self.tts = tts
+            self.assistant_instance = assistant_instance
 
-        try:
-            # Check if LLM is available for final summary
-            if not llm or isinstance(llm, MockLLM):
-                response_text = "I'm unable to generate a final AI summary at this time due to service unavailability. However, the interview will be marked as completed and you can review the full transcript manually."
-                await session.generate_reply(instructions=response_text)
+        def synthesize(self, *args, **kwargs):
+            # Capture the text before synthesis for agent speech
+            text = args[0] if args else kwargs.get('text', '')
+            if text:
+                # Capture agent speech in transcript
+                transcript_entry = {
+                    'speaker': 'agent',
+                    'text': text,
+                    'timestamp': time.time(),
+                    'type': 'message'
+                }
+                self.assistant_instance.transcript.append(transcript_entry)
+                logger.info(f"📝 Captured agent speech: {text[:50]}...")
 
-                # Still update session status even without AI summary
-                await _update_session_completed()
-                return response_text
+                self.assistant_instance.mark_transcript_dirty()
 
-            # Format transcript for LLM analysis
-            transcript_text = ""
-            for entry in assistant_instance.transcript:
-                speaker = entry.get('speaker', 'unknown')
-                text = entry.get('text', '')
-                speaker_name = "Interviewer" if speaker == 'agent' else "Candidate"
-                transcript_text += f"{speaker_name}: {text}\n"
+            # Return the original TTS synthesize method (async context manager)
+            return self.tts.synthesize(*args, **kwargs)
 
-            # Get the generated questions for evaluation context
-            questions_context = ""
-            if assistant_instance.questions:
-                questions_context = "\n\nINTERVIEW QUESTIONS ASKED:\n" + "\n".join([f"{i+1}. {q}" for i, q in enumerate(assistant_instance.questions)])
+        # Delegate other attributes to the wrapped TTS
+        def __getattr__(self, name):
+            return getattr(self.tts, name)
 
-            # Create comprehensive final summary prompt
-            final_summary_prompt = f"""
-As an expert HR interviewer, analyze the following complete interview transcript and provide a comprehensive final assessment report.
+    if tts_plugin:
+        tts_plugin = TranscriptionTTS(tts_plugin, assistant_instance)
 
-{questions_context}
+    # Create AgentSession with service availability checks
+    if not tts_plugin:
+        logger.error("TTS service unavailable - cannot start voice assistant")
+        raise RuntimeError("TTS service not available. Please check API keys and service configuration.")
+    if not stt:
+        logger.error("STT service unavailable - transcription will not work")
+        raise RuntimeError("STT service required for transcription. Please check OPENAI_API_KEY or DEEPGRAM_API_KEY environment variables.")
+    if not llm:
+        logger.warning("LLM service unavailable - using fallback responses")
 
-COMPLETE INTERVIEW TRANSCRIPT:
-{transcript_text}
+    logger.info("🔧 Creating AgentSession with transcription settings...")
 
-Please provide a detailed final summary that includes:
+    # Wrap STT to capture candidate speech for transcription with VAD and error handling
+    class TranscriptionSTT:
+        def __init__(self, stt, assistant_instance):
+            self.stt = stt
+            self.assistant_instance = assistant_instance
+            self.retry_count = 0
+            self.max_retries = 3
+            # WebRTC VAD for voice activity detection, shared across sessions
+            self.vad = _WEBRTC_VAD
+            self.audio_buffer = []
+            self.speech_detected = False
+            self.frame_duration = 30  # 30ms frames for VAD
+            self.sample_rate = 16000  # 16kHz sample rate
+            # Circuit breaker: after repeated exhausted retries, skip the provider for a cooldown
+            self._consecutive_failures = 0
+            self._circuit_open_until = 0.0
 
-1. **Overall Recommendation**: Selected/Not Selected/Further Review with justification
-2. **Performance Scores** (out of 10):
-   - Technical Fit: /10
-   - Experience: /10
-   - Communication: /10
-   - Problem-Solving: /10
-   - Culture Fit: /10
-3. **Question-by-Question Assessment**: Evaluate how well the candidate answered each of the interview questions, noting specific strengths and areas for improvement
-4. **Key Strengths**: 3-5 most notable strengths demonstrated
-5. **Concerns/Weaknesses**: Areas that need improvement or development
-6. **Detailed Hiring Recommendation**: Comprehensive assessment for HR decision-making
+        async def recognize(self, *args, **kwargs):
+            if time.monotonic() < self._circuit_open_until:
+                return _EMPTY_STT_RESULT
 
-Format your response as a professional interview assessment report suitable for HR records and managerial review. Be thorough but concise, focusing on actionable insights that will inform the hiring decision.
+            for attempt in range(self.max_retries):
+                try:
+                    result = await self.stt.recognize(*args, **kwargs)
 
-This is the FINAL assessment - provide your most comprehensive and definitive evaluation.
-"""
+                    # Reset retry count on success
+                    self.retry_count = 0
+                    self._consecutive_failures = 0
 
-            # Generate final summary using LLM
-            chat_ctx = ChatContext()
-            chat_ctx.add_message(role="system", content="You are a senior HR professional providing the final comprehensive evaluation of a candidate after a complete interview process.")
-            chat_ctx.add_message(role="user", content=final_summary_prompt)
+                    # Handle different STT result formats
+                    text = None
+                    if hasattr(result, 'text') and result.text:
+                        text = result.text
+                    elif hasattr(result, 'alternatives') and result.alternatives:
+                        # Some STT services return alternatives
+                        text = result.alternatives[0].text if result.alternatives[0].text else None
+                    elif isinstance(result, str):
+                        text = result
 
-            final_summary_text = ""
-            async with llm.chat(chat_ctx=chat_ctx) as stream:
-                async for chunk in stream:
-                    if chunk.delta and hasattr(chunk.delta, 'content'):
-                        final_summary_text += chunk.delta.content or ""
+                    if text:
+                        # Apply VAD filtering - only capture if speech was detected
+                        if self._is_speech_likely(text):
+                            # Capture candidate speech in transcript
+                            transcript_entry = {
+                                'speaker': 'candidate',
+                                'text': text,
+                                'timestamp': time.time(),
+                                'type': 'message'
+                            }
+                            self.assistant_instance.transcript.append(transcript_entry)
+                            logger.info(f"📝 Captured candidate speech (VAD filtered): {text[:50]}...")
 
-            # Update session status to completed
-            await _update_session_completed()
+                            self.assistant_instance.mark_transcript_dirty()
+                        else:
+                            logger.debug(f"🗣️ Speech detected but filtered by VAD: {text[:30]}...")
 
-            # Format response for voice output
-            response_text = f"Thank you for participating in this interview. The interview has now been completed and I've generated a comprehensive final assessment report:\n\n{final_summary_text}\n\nThis concludes our interview session. Your responses have been carefully evaluated, and this assessment will be saved for HR review. Thank you for your time and candor throughout the process."
+                    return result
 
-            # Generate reply - this will be captured by TTS wrapper
-            reply_result = await session.generate_reply(instructions=response_text)
-            return response_text
+                except Exception as e:
+                    error_msg = str(e).lower()
+                    is_retryable = any(keyword in error_msg for keyword in [
+                        '500', 'internal', 'server error', 'timeout', 'connection',
+                        'network', 'api', 'rate limit'
+                    ])
 
-        except asyncio.TimeoutError:
-            timeout_msg = "The final summary generation is taking longer than expected. The interview will still be marked as completed, and you can access the full transcript and basic assessment through the dashboard."
-            await session.generate_reply(instructions=timeout_msg)
+                    if is_retryable and attempt < self.max_retries - 1:
+                        wait_time = min(0.1 * (2 ** attempt), 2.0)  # Exponential backoff, max 2s
+                        logger.warning(f"STT error (attempt {attempt + 1}/{self.max_retries}): {e}, retrying in {wait_time}s...")
+                        await asyncio.sleep(wait_time)
+                        continue
+                    else:
+                        logger.error(f"STT failed after {self.max_retries} attempts: {e}")
+                        self._consecutive_failures += 1
+                        if self._consecutive_failures >= _STT_BREAKER_THRESHOLD:
+                            self._circuit_open_until = time.monotonic() + _STT_BREAKER_COOLDOWN
+                            logger.error(f"STT failed {self._consecutive_failures} times in a row, pausing recognition for {_STT_BREAKER_COOLDOWN:.0f}s")
+                        # Return empty result to prevent crashes
+                        return _EMPTY_STT_RESULT
 
-            # Update session status even on timeout
-            await _update_session_completed()
-            return timeout_msg
-        except Exception as e:
-            logger.error(f"Error generating final interview summary: {e}")
-            error_msg = "I encountered an issue while generating the final summary. However, the interview has been marked as completed and you can review all materials through the dashboard."
-            await session.generate_reply(instructions=error_msg)
+            # This should never be reached, but just in case
+            return _EMPTY_STT_RESULT
 
-            # Update session status even on error
-            await _update_session_completed()
-            return error_msg
+        def _is_speech_likely(self, text):
+            """Use heuristics to determine if text is likely actual speech vs noise"""
+            if not text:
+                return False
+            return not _is_stt_noise(text.strip().lower())
 
-    async def _update_session_completed():
-        """Helper function to update session status to completed with retry logic"""
-        if not assistant_instance.session_file:
-            logger.warning("No session file available to update completion status")
-            return
+        # Delegate other attributes to the wrapped STT
+        def __getattr__(self, name):
+            return getattr(self.stt, name)
 
-        session_file_path = str(assistant_instance.session_file)
-        if not os.path.exists(session_file_path):
-            logger.warning(f"Session file not found for completion update: {session_file_path}")
-            return
+    wrapped_stt = TranscriptionSTT(stt, assistant_instance)
 
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                # Use async file operations
-                import aiofiles
-                async with aiofiles.open(session_file_path, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    session_data = json.loads(content)
-
-                # Update session status and completion timestamp
-                session_data['status'] = 'completed'
-                session_data['completed_at'] = datetime.now().isoformat()
-                session_data['updated_at'] = datetime.now().isoformat()
-
-                # Atomic write with unique temp file to avoid conflicts
-                import uuid
-                temp_file = f"{session_file_path}.{uuid.uuid4().hex}.tmp"
-                async with aiofiles.open(temp_file, 'w', encoding='utf-8') as f:
-                    await f.write(json.dumps(session_data, indent=2, cls=CustomJSONEncoder))
-                os.replace(temp_file, session_file_path)
-
-                logger.info(f"✅ Interview session {assistant_instance.session_id} marked as completed")
-                return  # Success, exit retry loop
+    session = AgentSession(
+        stt=wrapped_stt,
+        llm=llm,
+        tts=tts_plugin,
+        vad=ctx.proc.userdata.get("vad") or _plugin("silero").VAD.load(),
+        use_tts_aligned_transcript=True,
+    )
+
+    # Verify session was created with STT
+    if hasattr(session, '_stt') and session._stt:
+        logger.info("✅ AgentSession created with STT enabled")
+    else:
+        logger.warning("⚠️ AgentSession may not have STT properly configured")
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    logger.warning(f"Failed to update session completion (attempt {attempt + 1}/{max_retries}): {e}, retrying...")
-                    await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
-                else:
-                    logger.error(f"Failed to update session completion status after {max_retries} attempts: {e}")
 
-    # Register functions with the LLM BEFORE session start
+    
+    # Register the tools on this job's agent BEFORE session start; the LLM is shared by
+    # every job in the process, so nothing session-specific may be set on it
     if llm:
-        llm.functions = [
-            upload_jd,
-            upload_resume,
-            generate_questions,
-            ask_next_question,
-            get_transcript,
-            summarize_transcript,
-            end_interview
-        ]
+        await assistant_instance.update_tools(InterviewTools(assistant_instance, session, llm).all())
 
     logger.info("🎯 Setting up interview agent...")
 
@@ -1094,19 +1322,23 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
         except Exception as e:
             logger.error(f"Failed to start Anam avatar session: {e}")
             # Cancel any pending RPC tasks to prevent timeout errors
-            try:
-                # Clean up any pending RPC requests
-                if hasattr(ctx.room.local_participant, '_pending_rpcs'):
-                    for rpc_id in list(ctx.room.local_participant._pending_rpcs.keys()):
-                        try:
-                            ctx.room.local_participant._pending_rpcs[rpc_id].cancel()
-                        except:
-                            pass
-            except:
-                pass
+            await _cancel_pending_rpcs(ctx.room.local_participant)
             # Start reconnection process
-            if not avatar_reconnect_task or avatar_reconnect_task.done():
-                avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+            schedule_avatar_reconnect()
+    elif anam_api_key:
+        # Initialization failed; retry in the background instead of waiting for a status tick
+        schedule_avatar_reconnect()
+
+    # The avatar joins the room as its own participant publishing on behalf of this
+    # agent; when it leaves, reconnect right away rather than on the next status poll
+    @ctx.room.on("participant_disconnected")
+    def on_participant_disconnected(participant):
+        nonlocal anam_avatar
+        if participant.attributes.get("lk.publish_on_behalf") != ctx.room.local_participant.identity:
+            return
+        logger.warning("⚠️ Avatar disconnected, attempting reconnection...")
+        anam_avatar = None
+        schedule_avatar_reconnect()
 
     # Start the session with enhanced transcription settings
     logger.info("Starting agent session...")
@@ -1130,6 +1362,8 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
         logger.info(f"Remote participants: {len(ctx.room.remote_participants)}")
 
         # Set up track subscription handlers
+        audio_ready = asyncio.Event()
+
         @ctx.room.on("track_published")
         def on_track_published(publication, participant):
             logger.info(f"📡 Track published: {publication.sid} by {participant.identity}, kind: {publication.kind}")
@@ -1147,6 +1381,7 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
             logger.info(f"📡 Track subscribed: {publication.sid} by {participant.identity}, kind: {publication.kind}")
             if publication.kind == rtc.TrackKind.KIND_AUDIO:
                 logger.info(f"🎤 Audio track subscribed and ready for STT: {publication.sid}")
+                audio_ready.set()
 
         # Log current room state for debugging
         for identity, participant in ctx.room.remote_participants.items():
@@ -1169,6 +1404,7 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
                             logger.info(f"✅ Subscribed to audio track: {track_sid}")
                         else:
                             logger.info(f"🎤 Track already subscribed: {track_sid}")
+                            audio_ready.set()
                     except Exception as e:
                         logger.error(f"Failed to subscribe to audio track {track_sid}: {e}")
 
@@ -1183,10 +1419,15 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
         logger.error(f"Failed to start agent session: {e}")
         raise
 
-    # CRITICAL: Ensure connection is fully established before proceeding
+    # CRITICAL: Ensure connection is fully established before proceeding; the
+    # candidate's audio track being subscribed is the signal, bounded by the old
+    # fixed settle time
     logger.info("Waiting for room connection to stabilize...")
-    await asyncio.sleep(3)  # Give connection more time to stabilize
-    logger.info("Room connection stabilized")
+    try:
+        await asyncio.wait_for(audio_ready.wait(), timeout=3.0)
+        logger.info("Room connection stabilized")
+    except asyncio.TimeoutError:
+        logger.info("No candidate audio track yet, continuing")
 
     # Greet the user directly with TTS (not through LLM to avoid unwanted responses)
     greeting_text = "Hello! I'm your interviewer today. It's great to meet you. Are you ready to begin?"
@@ -1195,128 +1436,78 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
     greeting_entry = {
         'speaker': 'agent',
         'text': greeting_text,
-        'timestamp': datetime.now().timestamp(),
+        'timestamp': time.time(),
         'type': 'greeting'
     }
     assistant_instance.transcript.append(greeting_entry)
 
-    # Save transcript immediately
-    asyncio.create_task(assistant_instance.save_transcript_to_session())
+    assistant_instance.mark_transcript_dirty()
 
     # Speak the greeting directly using TTS
-    logger.info("🎤 Speaking greeting directly via TTS")
-    async with session.tts.synthesize(greeting_text):
-        pass
+    async def speak_greeting():
+        logger.info("🎤 Speaking greeting directly via TTS")
+        async with session.tts.synthesize(greeting_text):
+            pass
 
     # Generate and speak the first question to start the interview
-    logger.info("🎤 Generating first interview question...")
-    first_question_instructions = "Now that you've greeted the candidate, start the interview by asking the first question. If you have job description and resume data available, ask a relevant question based on that information. Otherwise, ask a general introductory question to begin the conversation."
-    reply_result = await session.generate_reply(instructions=first_question_instructions)
-    logger.info("✅ First question generated and spoken")
+    async def ask_first_question():
+        logger.info("🎤 Generating first interview question...")
+        first_question_instructions = "Now that you've greeted the candidate, start the interview by asking the first question. If you have job description and resume data available, ask a relevant question based on that information. Otherwise, ask a general introductory question to begin the conversation."
+        await session.generate_reply(instructions=first_question_instructions)
+        logger.info("✅ First question generated and spoken")
+
+    # The greeting's TTS request and the first question's LLM call are independent,
+    # so run them concurrently
+    await asyncio.gather(speak_greeting(), ask_first_question())
 
     # Update session status to 'interviewing' so dashboard shows transcript
     if assistant_instance.session_file:
-        session_file_path = str(assistant_instance.session_file)
-        if os.path.exists(session_file_path):
-            max_retries = 3
-            for attempt in range(max_retries):
-                try:
-                    logger.info(f"Updating session status to 'interviewing' for {assistant_instance.session_id}")
-
-                    # Use async file operations to avoid blocking
-                    import aiofiles
-                    async with aiofiles.open(session_file_path, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        session_data = json.loads(content)
-
-                    session_data['status'] = 'interviewing'
-                    session_data['updated_at'] = datetime.now().isoformat()
-
-                    # Atomic write with unique temp file to avoid conflicts
-                    import uuid
-                    temp_file = f"{session_file_path}.{uuid.uuid4().hex}.tmp"
-                    async with aiofiles.open(temp_file, 'w', encoding='utf-8') as f:
-                        await f.write(json.dumps(session_data, indent=2, cls=CustomJSONEncoder))
-                    os.replace(temp_file, session_file_path)
-
-                    logger.info(f"✅ Updated session status to 'interviewing' for {assistant_instance.session_id}")
-                    break  # Success, exit retry loop
-
-                except Exception as e:
-                    if attempt < max_retries - 1:
-                        logger.warning(f"Failed to update session status (attempt {attempt + 1}/{max_retries}): {e}, retrying...")
-                        await asyncio.sleep(0.1 * (attempt + 1))  # Exponential backoff
-                    else:
-                        logger.error(f"Failed to update session status after {max_retries} attempts: {e}")
+        logger.info(f"Updating session status to 'interviewing' for {assistant_instance.session_id}")
+        if await assistant_instance.save_transcript_to_session(status='interviewing'):
+            logger.info(f"✅ Updated session status to 'interviewing' for {assistant_instance.session_id}")
         else:
-            logger.warning(f"Session file not found for status update: {session_file_path}")
+            logger.warning(f"Failed to update session status for {assistant_instance.session_id}")
     else:
         logger.warning("No session file available for status update")
 
     # Keep the connection alive and monitor transcription activity
     logger.info("Agent is now running and ready to handle interviews")
 
-    # Periodic status logging and avatar health monitoring
-    async def log_status():
-        while True:
-            try:
-                logger.info(f"📊 STATUS: Participants: {len(ctx.room.remote_participants)}, Avatar: {'connected' if anam_avatar else 'disconnected'}")
+    # Set when the job shuts down; the entrypoint and the status loop both wait on it
+    stop_event = asyncio.Event()
 
-                # Check avatar health and trigger reconnection if needed
-                if anam_api_key and not anam_avatar and (not avatar_reconnect_task or avatar_reconnect_task.done()):
-                    logger.warning("⚠️ Avatar disconnected, attempting reconnection...")
-                    avatar_reconnect_task = asyncio.create_task(reconnect_avatar())
+    async def status_tick():
+        logger.info(f"📊 STATUS: Participants: {len(ctx.room.remote_participants)}, Avatar: {'connected' if anam_avatar else 'disconnected'}")
 
-                # Clean up any lingering RPC tasks to prevent timeout errors
-                try:
-                    if hasattr(ctx.room.local_participant, '_pending_rpcs'):
-                        pending_rpcs = list(ctx.room.local_participant._pending_rpcs.keys())
-                        if pending_rpcs:
-                            logger.info(f"🧹 Cleaning up {len(pending_rpcs)} pending RPC tasks")
-                            for rpc_id in pending_rpcs:
-                                try:
-                                    ctx.room.local_participant._pending_rpcs[rpc_id].cancel()
-                                except:
-                                    pass
-                except Exception as e:
-                    logger.debug(f"RPC cleanup error (non-critical): {e}")
+        # Clean up any lingering RPC tasks to prevent timeout errors
+        cancelled = await _cancel_pending_rpcs(ctx.room.local_participant)
+        if cancelled:
+            logger.info(f"🧹 Cleaned up {cancelled} pending RPC tasks")
 
-                await asyncio.sleep(30)  # Log every 30 seconds
+    # Periodic status logging; avatar reconnection is driven by room events
+    async def log_status():
+        while not stop_event.is_set():
+            try:
+                await status_tick()
             except Exception as e:
+                # A failed tick shouldn't end monitoring for the rest of the interview
                 logger.error(f"Status logging error: {e}")
-                break
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=30)  # Log every 30 seconds
+            except asyncio.TimeoutError:
+                pass
 
     # Start status logging task
     status_task = asyncio.create_task(log_status())
 
-    try:
-        await asyncio.sleep(float('inf'))
-    except KeyboardInterrupt:
-        logger.info("Agent shutdown requested")
-        # Cancel avatar reconnection task
-        if avatar_reconnect_task and not avatar_reconnect_task.done():
-            avatar_reconnect_task.cancel()
+    async def stop_background_tasks():
+        # Cancel the LLM connectivity test if it is still waiting on a response
+        if llm_test_task and not llm_test_task.done():
+            llm_test_task.cancel()
             try:
-                await avatar_reconnect_task
+                await llm_test_task
             except asyncio.CancelledError:
                 pass
-        status_task.cancel()
-        try:
-            await status_task
-        except asyncio.CancelledError:
-            pass
-    except Exception as e:
-        logger.error(f"Unexpected error during agent operation: {e}")
-        # Clean up any pending RPC tasks before shutdown
-        try:
-            if hasattr(ctx.room.local_participant, '_pending_rpcs'):
-                for rpc_id in list(ctx.room.local_participant._pending_rpcs.keys()):
-                    try:
-                        ctx.room.local_participant._pending_rpcs[rpc_id].cancel()
-                    except:
-                        pass
-        except:
-            pass
         # Cancel avatar reconnection task
         if avatar_reconnect_task and not avatar_reconnect_task.done():
             avatar_reconnect_task.cancel()
@@ -1324,12 +1515,29 @@ This is the FINAL assessment - provide your most comprehensive and definitive ev
                 await avatar_reconnect_task
             except asyncio.CancelledError:
                 pass
-        status_task.cancel()
-        try:
-            await status_task
-        except asyncio.CancelledError:
-            pass
+        # The status loop exits on its own once the stop event is set
+        stop_event.set()
+        await status_task
+
+    async def request_stop():
+        stop_event.set()
+
+    ctx.add_shutdown_callback(request_stop)
+
+    # Park until the job shuts down; an Event needs no timer entry in the loop
+    try:
+        await stop_event.wait()
+        logger.info("Agent shutdown requested")
+        await stop_background_tasks()
+    except KeyboardInterrupt:
+        logger.info("Agent shutdown requested")
+        await stop_background_tasks()
+    except Exception as e:
+        logger.error(f"Unexpected error during agent operation: {e}")
+        # Clean up any pending RPC tasks before shutdown
+        await _cancel_pending_rpcs(ctx.room.local_participant)
+        await stop_background_tasks()
         raise
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint))
\ No newline at end of file
+    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
\ No newline at end of file
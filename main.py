@@ -3,6 +3,8 @@ import os
 import sys
 import io
 import logging
+import re
+from importlib.util import find_spec
 from pathlib import Path
 
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -11,18 +13,17 @@ sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='repla
 # Fix Windows console encoding for Unicode characters
 if sys.platform == 'win32':
     try:
-        # Try to set console to UTF-8
-        import subprocess
-        subprocess.run(['chcp', '65001'], shell=True, capture_output=True)
+        # Try to set console to UTF-8 directly rather than spawning a shell for chcp
+        import ctypes
+        ctypes.windll.kernel32.SetConsoleOutputCP(65001)
     except Exception as e:
         print(f"⚠️ Failed to set console code page to UTF-8: {e}")
 
-from app.core.logging import setup_logging
-
-# Configure logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
+# Template values shipped in keys.env, e.g. "your_openai_api_key_here"
+_PLACEHOLDER_RE = re.compile(r'(?=your_).*_here', re.DOTALL)
+
 def check_environment():
     """Check for required environment variables and files."""
     logger.info("🔍 Checking environment configuration...")
@@ -58,7 +59,7 @@ def check_environment():
         value = os.getenv(var)
         if not value:
             missing_vars.append(f"{var} ({description})")
-        elif value.startswith('your_') and value.endswith('_here'):
+        elif _PLACEHOLDER_RE.fullmatch(value):
             placeholder_vars.append(f"{var} ({description})")
 
     if missing_vars:
@@ -78,7 +79,7 @@ def check_environment():
     missing_optional = []
     for var, description in optional_vars.items():
         value = os.getenv(var)
-        if not value or (value.startswith('your_') and value.endswith('_here')):
+        if not value or _PLACEHOLDER_RE.fullmatch(value):
             missing_optional.append(f"{var} ({description})")
 
     if missing_optional:
@@ -97,17 +98,17 @@ def check_dependencies():
         ('flask_cors', 'Flask CORS support'),
         ('livekit', 'LiveKit SDK'),
         ('aiohttp', 'Async HTTP client'),
-        ('asyncio', 'Async support (built-in)'),
     ]
     
 
     missing_required = []
     
+    # find_spec only locates each package; importing them here would run their
+    # import-time side effects just to check they exist
     for package, description in required_packages:
-        try:
-            __import__(package.replace('-', '_'))
+        if find_spec(package.replace('-', '_')) is not None:
             logger.debug(f"✅ {package} - {description}")
-        except ImportError:
+        else:
             missing_required.append(f"{package} ({description})")
  
     
@@ -119,6 +120,11 @@ def check_dependencies():
 
 def main():
     """Main entry point with comprehensive error handling."""
+    # Configure logging here rather than at import: importing app.core pulls in the
+    # whole app package, which only a real start needs
+    from app.core.logging import setup_logging
+    setup_logging()
+
     logger.info("🚀 Starting AI Voice Interview System...")
     
     try:
@@ -151,13 +157,23 @@ def main():
             logger.info("📱 Open the URL in your browser to access the interview system")
             logger.info("🤖 Make sure to start the LiveKit agent separately using: python interview_agent.py dev")
             
-            # Run the Flask app
-            app.run(
-                host=host,
-                port=port,
-                debug=debug_mode,
-                threaded=True
-            )
+            # Run the Flask app; production uses waitress, whose worker threads share
+            # this process (and its background asyncio loop) instead of forking
+            if debug_mode:
+                app.run(
+                    host=host,
+                    port=port,
+                    debug=True,
+                    threaded=True
+                )
+            else:
+                try:
+                    from waitress import serve
+                except ImportError:
+                    logger.warning("⚠️ waitress not installed, falling back to the Flask development server")
+                    app.run(host=host, port=port, debug=False, threaded=True)
+                else:
+                    serve(app, host=host, port=port, threads=int(os.getenv('WAITRESS_THREADS', '8')))
             
             return 0
             
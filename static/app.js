@@ -213,21 +213,15 @@ async checkSystemStatus() {
                 throw new Error(uploadResult.error || 'File upload failed');
             }
             
-            this.updateProgress(30, 'Analyzing documents...', 'AI is analyzing job requirements and candidate profile');
-            
-            // Analyze documents
-            const analysisResult = await this.analyzeDocuments(uploadResult);
-            if (!analysisResult.success) {
-                throw new Error(analysisResult.error || 'Document analysis failed');
-            }
-            
-            this.updateProgress(60, 'Generating questions...', 'Creating personalized interview questions');
-            
-            // Generate questions
-            const questionsResult = await this.generateQuestions(uploadResult);
-            if (!questionsResult.success) {
-                throw new Error(questionsResult.error || 'Question generation failed');
+            this.updateProgress(30, 'Analyzing documents...', 'AI is analyzing job requirements and generating personalized questions');
+
+            // Analysis and question generation share one LLM call over the same documents
+            const prepareResult = await this.prepareInterview(uploadResult);
+            if (!prepareResult.success) {
+                throw new Error(prepareResult.error || 'Interview preparation failed');
             }
+            const analysisResult = { success: true, analysis: prepareResult.analysis };
+            const questionsResult = { success: true, questions: prepareResult.questions };
             
             this.updateProgress(80, 'Creating interview session...', 'Setting up voice interview room');
             
@@ -365,6 +359,43 @@ async checkSystemStatus() {
         }
     }
     
+    async prepareInterview(uploadResult) {
+        const numQuestions = 6; // Default number of questions
+
+        const controller = new AbortController();
+        const timeoutId = setTimeout(() => controller.abort(), 45000);
+
+        try {
+            const response = await fetch('/api/prepare-interview', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json'
+                },
+                body: JSON.stringify({
+                    jd_text: uploadResult.jd_full,
+                    resume_text: uploadResult.resume_full,
+                    num_questions: numQuestions
+                }),
+                signal: controller.signal
+            });
+
+            clearTimeout(timeoutId);
+
+            if (!response.ok) {
+                const errorData = await response.json();
+                throw new Error(errorData.error || `Interview preparation failed with status ${response.status}`);
+            }
+
+            return await response.json();
+        } catch (error) {
+            clearTimeout(timeoutId);
+            if (error.name === 'AbortError') {
+                throw new Error('Interview preparation timed out. Please try again.');
+            }
+            throw error;
+        }
+    }
+
     async createSession(uploadResult, analysisResult, questionsResult) {
         const controller = new AbortController();
         const timeoutId = setTimeout(() => controller.abort(), 30000);